@@ -1,57 +1,213 @@
 #!/usr/bin/env python3
 """Check if Zarr store dimensions match expected and reset if needed."""
 
+import json
+import os
 import shutil
+import subprocess
+import sys
+import time
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any
 
-import xarray as xr
+import fsspec
+import zarr
 
 from nbm_to_zarr.noaa.nbm_conus.forecast import NbmConusForecastDataset
 
 
-def check_and_reset_dimensions() -> None:
-    """Check if existing Zarr store has correct dimensions, reset if not."""
+def _add_dims(
+    dims: dict[str, int], dim_names: Sequence[str | None] | None, shape: Sequence[int], name: str
+) -> None:
+    """Record an array's dimension sizes, skipping arrays without usable names.
+
+    Names come from Zarr v3 `dimension_names` or xarray's v2 `_ARRAY_DIMENSIONS`.
+    An array with neither (or with names that don't match its shape) isn't an
+    xarray variable, so it says nothing about the dataset's dimensions.
+    """
+    if not dim_names or len(dim_names) != len(shape) or None in dim_names:
+        if dim_names:
+            print(f"⚠️  Ignoring {name}: dimension names {list(dim_names)} don't match shape {list(shape)}")
+        return
+    dims.update(zip(dim_names, shape, strict=True))
+
+
+def _read_remote_dimensions(url: str) -> dict[str, int]:
+    """Read dimension sizes of an object-store (s3://, gs://) Zarr store.
+
+    Opening the store through zarr costs a LIST per group and a GET per array.
+    Here the keys are listed once and every `.zarray`/`.zattrs` (v2) or
+    `zarr.json` (v3) file is fetched with a single bulk `cat`, then parsed locally.
+    """
+    fs, root = fsspec.core.url_to_fs(url)
+    root = root.rstrip("/")
+    keys = [key for key in fs.find(root) if key.endswith((".zarray", ".zattrs", "zarr.json"))]
+    blobs = fs.cat(keys)
+
+    dims: dict[str, int] = {}
+    for key, blob in blobs.items():
+        if key.endswith("/zarr.json"):
+            array_meta = json.loads(blob)
+            if array_meta.get("node_type") != "array":
+                continue
+            dim_names = array_meta.get("dimension_names")
+        elif key.endswith("/.zarray"):
+            array_meta = json.loads(blob)
+            attrs_blob = blobs.get(f"{key.removesuffix('/.zarray')}/.zattrs")
+            attrs = json.loads(attrs_blob) if attrs_blob is not None else {}
+            dim_names = attrs.get("_ARRAY_DIMENSIONS")
+        else:
+            continue
+        _add_dims(dims, dim_names, array_meta["shape"], key.rsplit("/", 2)[-2])
+    return dims
+
+
+def _read_unconsolidated_dimensions(store: Any) -> dict[str, int]:  # noqa: ANN401
+    """Read dimension sizes from per-array metadata when `.zmetadata` is missing.
+
+    Each array's metadata is a separate file (or object-store GET), so the
+    reads are issued concurrently instead of one array at a time. Object-store
+    URLs are read from a single key listing instead.
+    """
+    if isinstance(store, str) and "://" in store:
+        return _read_remote_dimensions(store)
+
+    group = zarr.open_group(store, mode="r")
+    array_names = list(group.array_keys())
+    if not array_names:
+        return {}
+
+    def array_dimensions(name: str) -> dict[str, int]:
+        array = group[name]
+        # zarr-python 3 exposes v3 names on the metadata; v2 arrays (and zarr 2) have none
+        dim_names = getattr(getattr(array, "metadata", None), "dimension_names", None)
+        if dim_names is None:
+            dim_names = array.attrs.get("_ARRAY_DIMENSIONS")
+        array_dims: dict[str, int] = {}
+        _add_dims(array_dims, dim_names, array.shape, name)
+        return array_dims
+
+    dims: dict[str, int] = {}
+    with ThreadPoolExecutor(max_workers=min(16, len(array_names))) as executor:
+        for array_dims in executor.map(array_dimensions, array_names):
+            dims.update(array_dims)
+    return dims
+
+
+def read_store_dimensions(zarr_path: Path, store: Any = None) -> dict[str, int]:  # noqa: ANN401
+    """Read dimension sizes for a Zarr store.
+
+    For Zarr v2 stores, parses the consolidated `.zmetadata` JSON directly,
+    pairing each array's `shape` with the `_ARRAY_DIMENSIONS` names xarray stores
+    in `.zattrs`.
+    Falls back to reading each array's metadata if `.zmetadata` is missing (as
+    in Zarr v3 stores), through `store` when one is given.
+    """
+    zmetadata_path = zarr_path / ".zmetadata"
+    if not zmetadata_path.exists():
+        return _read_unconsolidated_dimensions(store if store is not None else str(zarr_path))
+
+    metadata = json.loads(zmetadata_path.read_text())["metadata"]
+
+    dims: dict[str, int] = {}
+    for key, array_meta in metadata.items():
+        if not key.endswith("/.zarray"):
+            continue
+        array_name = key.removesuffix("/.zarray")
+        attrs = metadata.get(f"{array_name}/.zattrs", {})
+        _add_dims(dims, attrs.get("_ARRAY_DIMENSIONS"), array_meta["shape"], array_name)
+    return dims
+
+
+def remove_store(zarr_path: Path) -> None:
+    """Remove a Zarr store without blocking on the delete.
+
+    The store is renamed to a sibling tombstone path (an O(1) operation) and
+    a detached process deletes the tombstone in the background. If the rename
+    fails, the store is removed synchronously instead.
+    """
+    tombstone = zarr_path.with_name(f"{zarr_path.name}.trash-{os.getpid()}-{time.time_ns()}")
+    try:
+        zarr_path.rename(tombstone)
+    except OSError:
+        shutil.rmtree(zarr_path)
+        return
+
+    subprocess.Popen(  # noqa: S603
+        [
+            sys.executable,
+            "-c",
+            f"import shutil; shutil.rmtree({str(tombstone)!r}, ignore_errors=True)",
+        ],
+        start_new_session=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def _compare_dims(
+    actual_dims: Mapping[str, int], expected_dims: Mapping[str, int]
+) -> list[tuple[str, int, int | None]]:
+    """Return (dim, expected, actual) for every dimension that doesn't match."""
+    return [
+        (dim, expected_size, actual_dims.get(dim))
+        for dim, expected_size in expected_dims.items()
+        if actual_dims.get(dim) != expected_size
+    ]
+
+
+def check_and_reset_dimensions(store: Any = None) -> Any:  # noqa: ANN401
+    """Check if existing Zarr store has correct dimensions, reset if not.
+
+    Args:
+        store: Optional already-open zarr store for the dataset. When omitted the
+            store path is used directly.
+
+    Returns:
+        The store that was checked, so an in-process caller can reuse it for the
+        subsequent write, or None if the store was removed, never existed, or
+        its dimensions couldn't be read.
+    """
     data_dir = Path("data")
     dataset = NbmConusForecastDataset()
     zarr_path = data_dir / f"{dataset.dataset_id}.zarr"
 
     if not zarr_path.exists():
         print(f"✅ No existing Zarr store at {zarr_path} - will create fresh")
-        return
+        return None
 
-    try:
-        # Open existing store
-        ds = xr.open_zarr(zarr_path, consolidated=True)
-
-        # Check dimensions
-        expected_dims = dataset.template_config.dimensions
-        actual_dims = dict(ds.sizes)
-
-        mismatch = False
-        for dim, expected_size in expected_dims.items():
-            actual_size = actual_dims.get(dim)
-            if actual_size is None:
-                print(f"⚠️  Missing dimension: {dim}")
-                mismatch = True
-            elif actual_size != expected_size:
-                print(f"⚠️  Dimension mismatch: {dim} (expected: {expected_size}, actual: {actual_size})")
-                mismatch = True
-
-        ds.close()
-
-        if mismatch:
-            print(f"\n🗑️  Removing old Zarr store with incorrect dimensions...")
-            shutil.rmtree(zarr_path)
-            print(f"✅ Removed {zarr_path} - will create fresh with correct dimensions")
-        else:
-            print(f"✅ Zarr store dimensions match expected: {expected_dims}")
+    if store is None:
+        store = str(zarr_path)
 
+    expected_dims = dataset.template_config.dimensions
+    try:
+        actual_dims = read_store_dimensions(zarr_path, store)
     except Exception as e:
-        print(f"⚠️  Error checking Zarr store: {e}")
-        print(f"🗑️  Removing potentially corrupted Zarr store...")
-        shutil.rmtree(zarr_path)
-        print(f"✅ Removed {zarr_path} - will create fresh")
+        # Failing to parse the metadata doesn't mean the store is corrupt, so it's
+        # left for the update to overwrite rather than deleted here
+        print(f"⚠️  Could not read dimensions of {zarr_path}: {e}")
+        print("Leaving the existing Zarr store in place")
+        return None
+
+    # Only format diagnostics when something is actually wrong
+    mismatches = _compare_dims(actual_dims, expected_dims)
+    if mismatches:
+        messages = [
+            f"⚠️  Missing dimension: {dim}"
+            if actual_size is None
+            else f"⚠️  Dimension mismatch: {dim} (expected: {expected_size}, actual: {actual_size})"
+            for dim, expected_size, actual_size in mismatches
+        ]
+        print("\n".join(messages))
+        print(f"\n🗑️  Removing old Zarr store with incorrect dimensions...")
+        remove_store(zarr_path)
+        print(f"✅ Removed {zarr_path} - will create fresh with correct dimensions")
+        return None
 
+    print(f"✅ Zarr store dimensions match expected: {dict(expected_dims)}")
+    return store
 
 if __name__ == "__main__":
     check_and_reset_dimensions()
@@ -2,12 +2,17 @@
 """Clean up old forecast data to maintain rolling storage."""
 
 import argparse
-import shutil
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
-import xarray as xr
+import zarr
+
+from zarr_helpers import open_zarr
 
 
 def cleanup_old_forecasts(max_age_hours: int = 24, keep_latest_only: bool = True) -> None:
@@ -18,73 +23,230 @@ def cleanup_old_forecasts(max_age_hours: int = 24, keep_latest_only: bool = True
         keep_latest_only: If True, keep only the most recent forecast run(s)
     """
     data_dir = Path("data")
+    zarr_paths = sorted(data_dir.glob("*.zarr"))
+    if not zarr_paths:
+        return
 
-    # Process each Zarr dataset
-    for zarr_path in data_dir.glob("*.zarr"):
-        try:
-            # Open the dataset
-            ds = xr.open_zarr(zarr_path, consolidated=True)
-
-            # Get the append dimension (usually 'init_time')
-            append_dim = "init_time"
-            if append_dim not in ds.dims:
-                print(f"Warning: {zarr_path} does not have '{append_dim}' dimension")
-                ds.close()
-                continue
+    # Stores are independent, so each one is trimmed in its own process
+    max_workers = min(len(zarr_paths), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(cleanup_store, zarr_path, max_age_hours, keep_latest_only)
+            for zarr_path in zarr_paths
+        ]
+        for future in futures:
+            future.result()
 
-            # Find indices to keep
-            init_times = pd.DatetimeIndex(ds[append_dim].values)
-
-            # Ensure timezone-naive for comparison
-            if init_times.tz is not None:
-                init_times = init_times.tz_localize(None)
-
-            if keep_latest_only:
-                # Keep only the most recent forecast run (most recent init_time)
-                # This keeps just 1 forecast run with all its lead times
-                max_init_time = init_times.max()
-                keep_mask = init_times == max_init_time
-                print(f"Keeping only latest forecast: {max_init_time}")
-            else:
-                # Keep forecasts within the time window
-                cutoff_time = pd.Timestamp.now(tz="UTC") - timedelta(hours=max_age_hours)
-                cutoff_time_naive = cutoff_time.tz_localize(None) if cutoff_time.tz is not None else cutoff_time
-                keep_mask = init_times >= cutoff_time_naive
-                print(f"Keeping forecasts newer than {cutoff_time_naive}")
-
-            if keep_mask.sum() == 0:
-                print(f"Warning: All data in {zarr_path} would be removed - keeping as is")
-                ds.close()
-                continue
+# Arrays spanning several init times per chunk are rewritten in memory; anything
+# bigger than this falls back to copying the whole store
+MAX_IN_MEMORY_REWRITE_BYTES = 64 * 1024**2
+
+# Concurrent unlink() calls; each releases the GIL for the syscall
+UNLINK_WORKERS = 32
+
+
+def unlink_all(paths: list[Path] | list[str]) -> None:
+    """Delete many files concurrently."""
+    if not paths:
+        return
+    with ThreadPoolExecutor(max_workers=min(UNLINK_WORKERS, len(paths))) as executor:
+        # Consume the results so any error is raised here
+        for _ in executor.map(os.unlink, paths):
+            pass
+
+
+def remove_tree(path: Path) -> None:
+    """Remove a directory tree, deleting its files concurrently.
+
+    A drop-in for `shutil.rmtree` on stores with many chunk files: files are
+    collected with `os.scandir`, unlinked from a thread pool, and the emptied
+    directories removed deepest first.
+    """
+    files: list[str] = []
+    dirs: list[str] = [str(path)]
+    pending = [str(path)]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append(entry.path)
+                    pending.append(entry.path)
+                else:
+                    files.append(entry.path)
+
+    unlink_all(files)
+    # Every directory is listed after its parent, so reversing removes children first
+    for directory in reversed(dirs):
+        os.rmdir(directory)
+
+
+def _chunk_index(key: str, separator: str, ndim: int) -> tuple[int, ...] | None:
+    """Parse a chunk key like `0.3.1.2` into indices, or None if it isn't one."""
+    parts = key.split(separator)
+    if len(parts) != ndim or not all(part.isdigit() for part in parts):
+        return None
+    return tuple(int(part) for part in parts)
+
+
+def trim_in_place(zarr_path: Path, append_dim: str, keep_mask: np.ndarray) -> bool:
+    """Drop init times from a Zarr v2 store without copying the kept data.
+
+    NBM variables are chunked one init time per chunk, so dropping init times
+    only means deleting their chunk files and renaming the kept ones down to
+    their new indices. Smaller arrays that share chunks across init times
+    (coordinates) are rewritten in memory, and the metadata is consolidated.
+
+    Returns:
+        False, without touching the store, if its layout can't be trimmed in
+        place (no consolidated v2 metadata, or large arrays sharing chunks
+        across init times)
+    """
+    zmetadata_path = zarr_path / ".zmetadata"
+    if not zmetadata_path.exists():
+        return False
+    metadata = json.loads(zmetadata_path.read_text())["metadata"]
+
+    # Old index -> new index for each kept init time
+    new_index = {int(old): new for new, old in enumerate(np.flatnonzero(keep_mask))}
+
+    chunk_arrays = []
+    rewrite_arrays = []
+    for key, array_meta in metadata.items():
+        if not key.endswith("/.zarray"):
+            continue
+        name = key.removesuffix("/.zarray")
+        dims = metadata.get(f"{name}/.zattrs", {}).get("_ARRAY_DIMENSIONS", [])
+        if append_dim not in dims:
+            continue
+        axis = dims.index(append_dim)
+        if array_meta["chunks"][axis] == 1:
+            chunk_arrays.append((name, axis, array_meta))
+        else:
+            nbytes = np.prod(array_meta["shape"]) * np.dtype(array_meta["dtype"]).itemsize
+            if nbytes > MAX_IN_MEMORY_REWRITE_BYTES:
+                return False
+            rewrite_arrays.append((name, axis))
+
+    for name, axis, array_meta in chunk_arrays:
+        array_dir = zarr_path / name
+        separator = array_meta.get("dimension_separator", ".")
+        ndim = len(array_meta["shape"])
 
-            if keep_mask.all():
-                print(f"No cleanup needed for {zarr_path}")
-                ds.close()
+        drops = []
+        moves = []
+        for path in array_dir.rglob("*"):
+            if not path.is_file():
                 continue
+            index = _chunk_index(path.relative_to(array_dir).as_posix(), separator, ndim)
+            if index is None:
+                continue
+            if index[axis] not in new_index:
+                drops.append(path)
+            elif new_index[index[axis]] != index[axis]:
+                moves.append((index, path))
+        unlink_all(drops)
+
+        # Kept chunks only move to lower indices, and dropped ones are already gone,
+        # so renaming in ascending order never overwrites a chunk still to be moved
+        for index, path in sorted(moves):
+            new_key = list(index)
+            new_key[axis] = new_index[index[axis]]
+            target = array_dir / separator.join(str(i) for i in new_key)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            path.rename(target)
+
+        if separator == "/":
+            # Nested chunk keys leave behind directories for the dropped init times
+            for path in sorted(array_dir.rglob("*"), reverse=True):
+                if path.is_dir() and not any(path.iterdir()):
+                    path.rmdir()
+
+        array_meta["shape"][axis] = len(new_index)
+        (array_dir / ".zarray").write_text(json.dumps(array_meta, indent=4))
+
+    for name, axis in rewrite_arrays:
+        array = zarr.open_array(str(zarr_path / name), mode="r+")
+        kept = np.compress(keep_mask, array[...], axis=axis)
+        array.resize(kept.shape)
+        array[...] = kept
+
+    zarr.consolidate_metadata(str(zarr_path))
+    return True
+
+
+def cleanup_store(zarr_path: Path, max_age_hours: int, keep_latest_only: bool) -> None:
+    """Remove old init times from a single Zarr dataset.
+
+    Args:
+        zarr_path: Path to the Zarr store
+        max_age_hours: Maximum age of forecasts to keep in hours (ignored if keep_latest_only=True)
+        keep_latest_only: If True, keep only the most recent forecast run(s)
+    """
+    try:
+        # Open the dataset
+        ds = open_zarr(zarr_path)
+
+        # Get the append dimension (usually 'init_time')
+        append_dim = "init_time"
+        if append_dim not in ds.dims:
+            print(f"Warning: {zarr_path} does not have '{append_dim}' dimension")
+            return
 
-            # Select only data to keep
-            ds_recent = ds.isel({append_dim: keep_mask})
+        # Find indices to keep
+        init_times = pd.DatetimeIndex(ds[append_dim].values)
 
-            # Create a temporary path
-            temp_path = zarr_path.parent / f"{zarr_path.name}.tmp"
+        # Ensure timezone-naive for comparison
+        if init_times.tz is not None:
+            init_times = init_times.tz_localize(None)
 
-            # Save the filtered dataset
-            ds_recent.to_zarr(temp_path, mode="w", consolidated=True)
+        if keep_latest_only:
+            # Keep only the most recent forecast run (most recent init_time)
+            # This keeps just 1 forecast run with all its lead times
+            max_init_time = init_times.max()
+            keep_mask = init_times == max_init_time
+            print(f"Keeping only latest forecast: {max_init_time}")
+        else:
+            # Keep forecasts within the time window
+            cutoff_time = pd.Timestamp.now(tz="UTC") - timedelta(hours=max_age_hours)
+            cutoff_time_naive = cutoff_time.tz_localize(None) if cutoff_time.tz is not None else cutoff_time
+            keep_mask = init_times >= cutoff_time_naive
+            print(f"Keeping forecasts newer than {cutoff_time_naive}")
 
-            ds.close()
-            ds_recent.close()
+        if keep_mask.sum() == 0:
+            print(f"Warning: All data in {zarr_path} would be removed - keeping as is")
+            return
 
-            # Replace the old dataset
-            shutil.rmtree(zarr_path)
-            temp_path.rename(zarr_path)
+        if keep_mask.all():
+            print(f"No cleanup needed for {zarr_path}")
+            return
 
-            removed_count = (~keep_mask).sum()
-            kept_count = keep_mask.sum()
+        removed_count = (~keep_mask).sum()
+        kept_count = keep_mask.sum()
+
+        if trim_in_place(zarr_path, append_dim, np.asarray(keep_mask)):
             print(f"✅ Kept {kept_count} init_time(s), removed {removed_count} from {zarr_path.name}")
+            return
 
-        except Exception as e:
-            print(f"Error processing {zarr_path}: {e}")
-            continue
+        # Select only data to keep
+        ds_recent = ds.isel({append_dim: keep_mask})
+
+        # Create a temporary path
+        temp_path = zarr_path.parent / f"{zarr_path.name}.tmp"
+
+        # Save the filtered dataset
+        ds_recent.to_zarr(temp_path, mode="w", consolidated=True)
+
+        ds.close()
+        ds_recent.close()
+
+        # Replace the old dataset
+        remove_tree(zarr_path)
+        temp_path.rename(zarr_path)
+
+        print(f"✅ Kept {kept_count} init_time(s), removed {removed_count} from {zarr_path.name}")
+
+    except Exception as e:
+        print(f"Error processing {zarr_path}: {e}")
 
 
 def main() -> None:
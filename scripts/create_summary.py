@@ -1,95 +1,95 @@
 #!/usr/bin/env python3
 """Create a summary document of available datasets."""
 
+import os
 from datetime import datetime
 from pathlib import Path
 
-import xarray as xr
+from zarr_helpers import open_zarr
+
+
+SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
 
 
 def format_size(size_bytes: int) -> str:
     """Format size in bytes to human-readable format."""
-    for unit in ["B", "KB", "MB", "GB", "TB"]:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.2f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.2f} PB"
+    # Each unit is 2**10 of the previous one, so the bit length picks the unit
+    idx = min(max(int(size_bytes).bit_length() - 1, 0) // 10, len(SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * idx)):.2f} {SIZE_UNITS[idx]}"
 
 
-def get_directory_size(path: Path) -> int:
+def get_directory_size(path: Path | str) -> int:
     """Calculate total size of directory."""
+    # os.scandir entries carry their file type, so only files need a stat() call
     total = 0
-    for item in path.rglob("*"):
-        if item.is_file():
-            total += item.stat().st_size
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_file(follow_symlinks=False):
+                total += entry.stat(follow_symlinks=False).st_size
+            elif entry.is_dir(follow_symlinks=False):
+                total += get_directory_size(entry.path)
     return total
 
 
+def dataset_section(zarr_path: Path) -> list[str]:
+    """Return the summary lines describing one Zarr dataset."""
+    ds = open_zarr(zarr_path)
+
+    # Get basic info
+    dataset_id = zarr_path.stem
+    size = get_directory_size(zarr_path)
+
+    lines = [
+        f"\n### {dataset_id}\n",
+        f"\n**Storage Size:** {format_size(size)}\n",
+    ]
+
+    # Add metadata
+    if "title" in ds.attrs:
+        lines.append(f"\n**Title:** {ds.attrs['title']}\n")
+    if "description" in ds.attrs:
+        lines.append(f"\n**Description:** {ds.attrs['description']}\n")
+
+    # Add dimension info
+    lines.append("\n**Dimensions:**\n")
+    for dim, size in ds.sizes.items():
+        lines.append(f"- {dim}: {size}\n")
+
+    # Add time range if available
+    if "init_time" in ds.dims:
+        init_times = ds["init_time"].values
+        lines.append(f"\n**Forecast Initialization Times:** {len(init_times)} cycles\n")
+        lines.append(f"- First: {str(init_times[0])}\n")
+        lines.append(f"- Last: {str(init_times[-1])}\n")
+
+    # Add variable list
+    lines.append(f"\n**Variables ({len(ds.data_vars)}):**\n")
+    for var in sorted(ds.data_vars.keys()):
+        long_name = ds[var].attrs.get("long_name", var)
+        lines.append(f"- `{var}`: {long_name}\n")
+
+    return lines
+
+
 def create_summary() -> None:
     """Create a summary document of available datasets."""
     data_dir = Path("data")
     summary_dir = Path("data_summary")
     summary_dir.mkdir(parents=True, exist_ok=True)
 
-    summary_lines = [
-        "# NBM Data Summary\n",
-        f"\nGenerated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}\n",
-        "\n## Available Datasets\n",
-    ]
-
-    # Process each Zarr dataset
-    for zarr_path in sorted(data_dir.glob("*.zarr")):
-        try:
-            ds = xr.open_zarr(zarr_path, consolidated=True)
-
-            # Get basic info
-            dataset_id = zarr_path.stem
-            size = get_directory_size(zarr_path)
-
-            summary_lines.append(f"\n### {dataset_id}\n")
-            summary_lines.append(f"\n**Storage Size:** {format_size(size)}\n")
-
-            # Add metadata
-            if "title" in ds.attrs:
-                summary_lines.append(f"\n**Title:** {ds.attrs['title']}\n")
-            if "description" in ds.attrs:
-                summary_lines.append(f"\n**Description:** {ds.attrs['description']}\n")
-
-            # Add dimension info
-            summary_lines.append("\n**Dimensions:**\n")
-            for dim, size in ds.dims.items():
-                summary_lines.append(f"- {dim}: {size}\n")
-
-            # Add time range if available
-            if "init_time" in ds.dims:
-                init_times = ds["init_time"].values
-                summary_lines.append(
-                    f"\n**Forecast Initialization Times:** "
-                    f"{len(init_times)} cycles\n"
-                )
-                summary_lines.append(
-                    f"- First: {str(init_times[0])}\n"
-                )
-                summary_lines.append(
-                    f"- Last: {str(init_times[-1])}\n"
-                )
-
-            # Add variable list
-            summary_lines.append(f"\n**Variables ({len(ds.data_vars)}):**\n")
-            for var in sorted(ds.data_vars.keys()):
-                long_name = ds[var].attrs.get("long_name", var)
-                summary_lines.append(f"- `{var}`: {long_name}\n")
-
-            ds.close()
-
-        except Exception as e:
-            summary_lines.append(f"\n### {zarr_path.name}\n")
-            summary_lines.append(f"\n**Error:** Could not read dataset: {e}\n")
-
-    # Write summary
     summary_path = summary_dir / "README.md"
     with open(summary_path, "w") as f:
-        f.writelines(summary_lines)
+        f.write("# NBM Data Summary\n")
+        f.write(f"\nGenerated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}\n")
+        f.write("\n## Available Datasets\n")
+
+        # Process each Zarr dataset, writing its section as soon as it's complete
+        for zarr_path in sorted(data_dir.glob("*.zarr")):
+            try:
+                f.writelines(dataset_section(zarr_path))
+            except Exception as e:
+                f.write(f"\n### {zarr_path.name}\n")
+                f.write(f"\n**Error:** Could not read dataset: {e}\n")
 
     print(f"Summary created at {summary_path}")
 
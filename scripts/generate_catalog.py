@@ -4,7 +4,34 @@
 import json
 from pathlib import Path
 
-import xarray as xr
+from zarr_helpers import open_zarr, read_zmetadata
+
+
+def summarize_zmetadata(metadata: dict) -> tuple[dict, dict[str, int], list[str]]:
+    """Return (attrs, dimensions, data variable names) from consolidated metadata.
+
+    Mirrors what xarray would report: an array is a coordinate if it names a
+    dimension or is listed in a `coordinates` attribute, and a data variable
+    otherwise.
+    """
+    attrs = metadata.get(".zattrs", {})
+    dims: dict[str, int] = {}
+    coord_names = set(attrs.get("coordinates", "").split())
+    array_names = []
+    for key, array_meta in metadata.items():
+        if not key.endswith("/.zarray"):
+            continue
+        name = key.removesuffix("/.zarray")
+        array_attrs = metadata.get(f"{name}/.zattrs", {})
+        dim_names = array_attrs.get("_ARRAY_DIMENSIONS", [])
+        dims.update(zip(dim_names, array_meta["shape"], strict=True))
+        coord_names.update(array_attrs.get("coordinates", "").split())
+        array_names.append(name)
+
+    variables = sorted(
+        name for name in array_names if name not in dims and name not in coord_names
+    )
+    return attrs, dims, variables
 
 
 def generate_catalog() -> None:
@@ -20,8 +47,16 @@ def generate_catalog() -> None:
         dataset_id = zarr_path.stem
 
         try:
-            # Open the dataset to get metadata
-            ds = xr.open_zarr(zarr_path, consolidated=True)
+            # Read metadata straight from `.zmetadata` when the store has it
+            metadata = read_zmetadata(zarr_path)
+            if metadata is not None:
+                attrs, dims, variables = summarize_zmetadata(metadata)
+            else:
+                ds = open_zarr(zarr_path)
+                attrs = ds.attrs
+                dims = {dim: int(size) for dim, size in ds.sizes.items()}
+                # Sorted like the `.zmetadata` path, so the order doesn't depend on the format
+                variables = sorted(ds.data_vars)
 
             datasets[dataset_id] = {
                 "driver": "zarr",
@@ -29,20 +64,18 @@ def generate_catalog() -> None:
                     "urlpath": str(zarr_path),
                     "consolidated": True,
                 },
-                "description": ds.attrs.get("description", ""),
+                "description": attrs.get("description", ""),
                 "metadata": {
-                    "title": ds.attrs.get("title", ""),
-                    "provider": ds.attrs.get("provider", ""),
-                    "model": ds.attrs.get("model", ""),
-                    "variant": ds.attrs.get("variant", ""),
-                    "version": ds.attrs.get("version", ""),
-                    "dimensions": {dim: int(ds.dims[dim]) for dim in ds.dims},
-                    "variables": list(ds.data_vars.keys()),
+                    "title": attrs.get("title", ""),
+                    "provider": attrs.get("provider", ""),
+                    "model": attrs.get("model", ""),
+                    "variant": attrs.get("variant", ""),
+                    "version": attrs.get("version", ""),
+                    "dimensions": dims,
+                    "variables": variables,
                 },
             }
 
-            ds.close()
-
         except Exception as e:
             print(f"Warning: Could not process {zarr_path}: {e}")
             continue
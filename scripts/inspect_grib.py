@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Inspect NBM GRIB2 file structure to identify available variables."""
 
+import shutil
 import sys
 from pathlib import Path
 
@@ -8,17 +9,35 @@ import pandas as pd
 import requests
 import rioxarray
 
+# Bytes per read/write while streaming a download
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# CONUS core file for forecast hour 1 of a cycle on NOMADS
+NBM_F001_URL = (
+    "https://nomads.ncep.noaa.gov/pub/data/nccf/com/blend/prod/"
+    "blend.{ymd}/{hh}/core/blend.t{hh}z.core.f001.co.grib2"
+)
+
+
+def nbm_f001_url(init_time: pd.Timestamp) -> str:
+    """Return the NBM CONUS f001 GRIB2 URL for a cycle."""
+    return NBM_F001_URL.format(ymd=init_time.strftime("%Y%m%d"), hh=f"{init_time.hour:02d}")
+
 
 def download_grib_file(url: str, output_path: Path) -> None:
     """Download a GRIB2 file."""
     print(f"Downloading: {url}")
-    response = requests.get(url, stream=True, timeout=60)
+    # GRIB2 is already compressed, so ask for it as-is
+    response = requests.get(
+        url, stream=True, timeout=60, headers={"Accept-Encoding": "identity"}
+    )
     response.raise_for_status()
+    # Still decode if the server applies a content encoding anyway
+    response.raw.decode_content = True
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
     with output_path.open("wb") as f:
-        for chunk in response.iter_content(chunk_size=8192):
-            f.write(chunk)
+        shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
 
     print(f"Downloaded to: {output_path}")
     print(f"Size: {output_path.stat().st_size / 1024 / 1024:.1f} MB")
@@ -40,8 +59,10 @@ def inspect_grib_file(file_path: Path) -> None:
             print(f"CRS: {src.crs}")
             print(f"\nBand metadata:\n")
 
-            for i in range(1, min(src.count + 1, 50)):  # First 50 bands
-                band_meta = src.tags(i)
+            # Read every band's tags once; both the listing and the summary use them
+            all_tags = [src.tags(i) for i in range(1, src.count + 1)]
+
+            for i, band_meta in enumerate(all_tags[:50], 1):  # First 50 bands
                 print(f"Band {i}:")
                 print(f"  GRIB_ELEMENT: {band_meta.get('GRIB_ELEMENT', 'N/A')}")
                 print(f"  GRIB_SHORT_NAME: {band_meta.get('GRIB_SHORT_NAME', 'N/A')}")
@@ -55,30 +76,28 @@ def inspect_grib_file(file_path: Path) -> None:
 
                 print()
 
-                # Group by element for summary
-                if i == min(src.count, 50):
-                    print(f"\n{'='*60}")
-                    print("Summary of available variables:")
-                    print(f"{'='*60}\n")
-
-                    elements = {}
-                    for j in range(1, src.count + 1):
-                        meta = src.tags(j)
-                        elem = meta.get('GRIB_ELEMENT', 'Unknown')
-                        short_name = meta.get('GRIB_SHORT_NAME', 'Unknown')
-                        comment = meta.get('GRIB_COMMENT', 'Unknown')
-
-                        if elem not in elements:
-                            elements[elem] = {
-                                'short_name': short_name,
-                                'comment': comment,
-                                'count': 0
-                            }
-                        elements[elem]['count'] += 1
-
-                    for elem, info in sorted(elements.items()):
-                        print(f"{elem} ({info['short_name']}): {info['count']} bands")
-                        print(f"  Description: {info['comment']}")
+            # Group by element for summary
+            print(f"\n{'='*60}")
+            print("Summary of available variables:")
+            print(f"{'='*60}\n")
+
+            elements = {}
+            for meta in all_tags:
+                elem = meta.get('GRIB_ELEMENT', 'Unknown')
+                short_name = meta.get('GRIB_SHORT_NAME', 'Unknown')
+                comment = meta.get('GRIB_COMMENT', 'Unknown')
+
+                if elem not in elements:
+                    elements[elem] = {
+                        'short_name': short_name,
+                        'comment': comment,
+                        'count': 0
+                    }
+                elements[elem]['count'] += 1
+
+            for elem, info in sorted(elements.items()):
+                print(f"{elem} ({info['short_name']}): {info['count']} bands")
+                print(f"  Description: {info['comment']}")
 
     except Exception as e:
         print(f"Error inspecting GRIB file: {e}")
@@ -96,11 +115,7 @@ def main() -> None:
     init_time = (current_time - pd.Timedelta(hours=2)).floor("h")
 
     # Build URL for f001 file (more likely to exist than f000)
-    url = (
-        f"https://nomads.ncep.noaa.gov/pub/data/nccf/com/blend/prod/"
-        f"blend.{init_time.strftime('%Y%m%d')}/{init_time.strftime('%H')}/core/"
-        f"blend.t{init_time.strftime('%H')}z.core.f001.co.grib2"
-    )
+    url = nbm_f001_url(init_time)
 
     output_path = Path("./test_data/inspect_grib.grib2")
 
@@ -112,11 +127,7 @@ def main() -> None:
         if e.response.status_code == 404:
             # Try previous cycle
             init_time = init_time - pd.Timedelta(hours=1)
-            url = (
-                f"https://nomads.ncep.noaa.gov/pub/data/nccf/com/blend/prod/"
-                f"blend.{init_time.strftime('%Y%m%d')}/{init_time.strftime('%H')}/core/"
-                f"blend.t{init_time.strftime('%H')}z.core.f001.co.grib2"
-            )
+            url = nbm_f001_url(init_time)
             print(f"\nTrying previous cycle: {url}")
             download_grib_file(url, output_path)
             inspect_grib_file(output_path)
@@ -12,35 +12,37 @@ def list_variables(file_path: Path) -> None:
     print("NBM GRIB2 Variables Summary")
     print(f"{'='*60}\n")
 
+    # Read every band's tags in one pass, then aggregate with the file closed
     with rasterio.open(file_path) as src:
-        print(f"Total bands: {src.count}\n")
-
-        # Collect all unique elements
-        elements = {}
-        for i in range(1, src.count + 1):
-            meta = src.tags(i)
-            elem = meta.get('GRIB_ELEMENT', 'Unknown')
-            short_name = meta.get('GRIB_SHORT_NAME', 'Unknown')
-            comment = meta.get('GRIB_COMMENT', 'Unknown')
-            unit = meta.get('GRIB_UNIT', 'Unknown')
-
-            if elem not in elements:
-                elements[elem] = {
-                    'short_name': short_name,
-                    'comment': comment,
-                    'unit': unit,
-                    'count': 0
-                }
-            elements[elem]['count'] += 1
-
-        print(f"{'GRIB_ELEMENT':<15} {'Description':<40} {'Unit':<10} {'Bands'}")
-        print("-" * 80)
-
-        for elem, info in sorted(elements.items()):
-            desc = info['comment'][:37] + "..." if len(info['comment']) > 40 else info['comment']
-            print(f"{elem:<15} {desc:<40} {info['unit']:<10} {info['count']}")
-
-        print(f"\nTotal unique variables: {len(elements)}")
+        band_tags = [src.tags(i) for i in range(1, src.count + 1)]
+
+    print(f"Total bands: {len(band_tags)}\n")
+
+    # Collect all unique elements
+    elements = {}
+    for meta in band_tags:
+        elem = meta.get('GRIB_ELEMENT', 'Unknown')
+        short_name = meta.get('GRIB_SHORT_NAME', 'Unknown')
+        comment = meta.get('GRIB_COMMENT', 'Unknown')
+        unit = meta.get('GRIB_UNIT', 'Unknown')
+
+        if elem not in elements:
+            elements[elem] = {
+                'short_name': short_name,
+                'comment': comment,
+                'unit': unit,
+                'count': 0
+            }
+        elements[elem]['count'] += 1
+
+    print(f"{'GRIB_ELEMENT':<15} {'Description':<40} {'Unit':<10} {'Bands'}")
+    print("-" * 80)
+
+    for elem, info in sorted(elements.items()):
+        desc = info['comment'][:37] + "..." if len(info['comment']) > 40 else info['comment']
+        print(f"{elem:<15} {desc:<40} {info['unit']:<10} {info['count']}")
+
+    print(f"\nTotal unique variables: {len(elements)}")
 
 
 if __name__ == "__main__":
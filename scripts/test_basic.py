@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
 """Basic test to verify template creation works."""
 
+import shutil
 import sys
+import traceback
 from pathlib import Path
 
 import pandas as pd
 
+from create_summary import get_directory_size
 from nbm_to_zarr.noaa.nbm_conus.forecast import NbmConusTemplateConfig
 
 
@@ -21,7 +24,7 @@ def test_template_creation() -> bool:
 
         print("\n✅ Template config created")
         print(f"   Dataset ID: {config.dataset_attributes.id}")
-        print(f"   Dimensions: {config.dimensions}")
+        print(f"   Dimensions: {dict(config.dimensions)}")
         print(f"   Variables: {len(config.data_vars)}")
 
         # Try to create a minimal template
@@ -50,47 +53,33 @@ def test_template_creation() -> bool:
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         if output_path.exists():
-            import shutil
-
             shutil.rmtree(output_path)
 
         # Remove timezone from datetime coordinates (Zarr doesn't support timezones)
         print("\nChecking for timezones in coordinates...")
+        replacements = {}
         for coord_name in ds.coords:
-            dtype_str = str(ds[coord_name].dtype)
-            print(f"  {coord_name}: dtype={dtype_str}")
-
-            # Check if coordinate is datetime-like
-            if 'datetime64' in dtype_str:
-                print(f"    -> Is datetime type")
-
-                # Check if timezone is in the dtype string (e.g., "datetime64[ns, UTC]")
-                if 'UTC' in dtype_str or 'utc' in dtype_str.lower():
-                    print(f"    -> Has UTC timezone in dtype string")
-                    # Convert values to timezone-naive
-                    values = ds[coord_name].values.astype('datetime64[ns]')
-                    ds = ds.assign_coords({coord_name: values})
-                    print(f"    ✅ Removed timezone from {coord_name}")
-                else:
-                    # Try pandas approach for other timezone formats
-                    dt_index = pd.DatetimeIndex(ds[coord_name].values)
-                    print(f"    -> dt_index.tz = {dt_index.tz}")
-                    if dt_index.tz is not None:
-                        values = dt_index.tz_localize(None).to_numpy()
-                        ds = ds.assign_coords({coord_name: values})
-                        print(f"    ✅ Removed timezone from {coord_name}")
+            dtype = ds[coord_name].dtype
+            print(f"  {coord_name}: dtype={dtype}")
+
+            # Timezone-aware coordinates carry a pandas dtype like "datetime64[ns, UTC]"
+            if getattr(dtype, 'tz', None) is not None:
+                print(f"    -> Has timezone {dtype.tz}")
+                # Values come back as UTC wall times, so numpy just drops the timezone
+                replacements[coord_name] = ds[coord_name].values.astype('datetime64[ns]')
+                print(f"    ✅ Removed timezone from {coord_name}")
+        if replacements:
+            ds = ds.assign_coords(replacements)
 
         ds.to_zarr(output_path, mode="w", consolidated=True, zarr_version=2)
 
         print(f"✅ Successfully saved to {output_path}")
-        print(f"   Size: {sum(f.stat().st_size for f in output_path.rglob('*') if f.is_file()) / 1024:.1f} KB")
+        print(f"   Size: {get_directory_size(output_path) / 1024:.1f} KB")
 
         return True
 
     except Exception as e:
         print(f"\n❌ Error: {e}")
-        import traceback
-
         traceback.print_exc()
         return False
 
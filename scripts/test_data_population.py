@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
 """Test that data population works correctly."""
 
+import shutil
 import sys
+import traceback
 from pathlib import Path
 
 import pandas as pd
+import xarray as xr
 
 from nbm_to_zarr.noaa.nbm_conus.forecast import NbmConusForecastDataset
 
@@ -26,7 +29,6 @@ def test_data_population() -> bool:
         # Clean up previous test
         output_path = output_dir / "noaa-nbm-conus-forecast.zarr"
         if output_path.exists():
-            import shutil
             shutil.rmtree(output_path)
 
         dataset.operational_update(output_dir)
@@ -36,8 +38,6 @@ def test_data_population() -> bool:
         print(f"{'='*60}\n")
 
         # Open and check the result
-        import xarray as xr
-
         ds = xr.open_zarr(output_path, consolidated=True)
 
         print(f"Dataset dimensions: {dict(ds.dims)}")
@@ -69,7 +69,6 @@ def test_data_population() -> bool:
 
     except Exception as e:
         print(f"\n❌ Error: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
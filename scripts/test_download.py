@@ -51,7 +51,7 @@ def test_minimal_download() -> bool:
 
     # Modify to only download a few forecast hours for testing
     print("\nGenerating source file coordinates (limited to 3 forecast hours)...")
-    all_coords = job.generate_source_file_coords()
+    all_coords = job.source_file_coords
     test_coords = [c for c in all_coords if c.forecast_hour in [0, 6, 12]]
 
     print(f"Testing with {len(test_coords)} files instead of {len(all_coords)}")
@@ -0,0 +1,23 @@
+"""Shared access to the Zarr stores under data/."""
+
+import json
+from pathlib import Path
+
+import xarray as xr
+
+
+def open_zarr(zarr_path: Path) -> xr.Dataset:
+    """Open a Zarr store through its consolidated metadata."""
+    return xr.open_zarr(zarr_path, consolidated=True)
+
+
+def read_zmetadata(zarr_path: Path) -> dict | None:
+    """Return the consolidated Zarr v2 metadata of a store, or None if it has none.
+
+    Keys are `.zattrs` for the group and `<name>/.zarray` / `<name>/.zattrs` for
+    each array.
+    """
+    try:
+        return json.loads((zarr_path / ".zmetadata").read_text())["metadata"]
+    except FileNotFoundError:
+        return None
@@ -2,36 +2,84 @@
 
 from __future__ import annotations
 
+import importlib
+from functools import lru_cache
 from pathlib import Path
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated, Any
 
 import typer
-from rich.console import Console
-from rich.table import Table
 
-from nbm_to_zarr.noaa.nbm_conus.forecast import NbmConusForecastDataset
+if TYPE_CHECKING:
+    from rich.console import Console
+
+    from nbm_to_zarr.base.dataset import Dataset
 
 app = typer.Typer(
     help="NBM to Zarr - NOAA National Blend of Models data reformatter",
     no_args_is_help=True,
 )
-console = Console()
 
-# Dataset registry
-DATASETS: dict[str, type] = {
-    "noaa-nbm-conus-forecast": NbmConusForecastDataset,
+# Dataset registry of "module:ClassName" paths, resolved lazily so that
+# `--help` and argument errors don't pay for importing xarray/zarr/pandas.
+DATASETS: dict[str, str] = {
+    "noaa-nbm-conus-forecast": "nbm_to_zarr.noaa.nbm_conus.forecast:NbmConusForecastDataset",
 }
 
 
+def _validate_dataset_id(value: str) -> str:
+    """Reject unknown dataset IDs while arguments are parsed, before any heavy imports."""
+    if value not in DATASETS:
+        typer.echo(f"Error: Unknown dataset ID '{value}'", err=True)
+        typer.echo("Use 'list-datasets' to see available options", err=True)
+        raise typer.Exit(1)
+    return value
+
+
+def _get_console() -> Console:
+    """Return a Rich console, importing Rich on first use."""
+    from rich.console import Console
+
+    return Console()
+
+
+@lru_cache(maxsize=None)
+def _get_dataset_class(dataset_id: str) -> type[Dataset]:  # type: ignore[type-arg]
+    """Import and return the dataset class registered under `dataset_id`."""
+    module_name, class_name = DATASETS[dataset_id].split(":")
+    return getattr(importlib.import_module(module_name), class_name)  # type: ignore[no-any-return]
+
+
+@lru_cache(maxsize=None)
+def _get_dataset(dataset_id: str) -> Dataset:  # type: ignore[type-arg]
+    """Return a shared dataset instance, so repeated commands reuse its template config."""
+    return _get_dataset_class(dataset_id)()
+
+
+def _read_template_attrs(template_path: Path) -> dict[str, Any]:
+    """Return an existing template's root attributes, or {} if it can't be read."""
+    if not template_path.exists():
+        return {}
+
+    import zarr
+
+    try:
+        return dict(zarr.open_group(str(template_path), mode="r").attrs)
+    except Exception:  # noqa: BLE001 - an unreadable template is simply rewritten
+        return {}
+
+
 @app.command()
 def list_datasets() -> None:
     """List all available datasets."""
+    from rich.table import Table
+
+    console = _get_console()
     table = Table(title="Available Datasets")
     table.add_column("ID", style="cyan")
     table.add_column("Description", style="green")
 
-    for dataset_id, dataset_class in DATASETS.items():
-        instance = dataset_class()
+    for dataset_id in DATASETS:
+        instance = _get_dataset(dataset_id)
         attrs = instance.template_config.dataset_attributes
         table.add_row(dataset_id, attrs.description)
 
@@ -42,7 +90,10 @@ def list_datasets() -> None:
 def update_template(
     dataset_id: Annotated[
         str,
-        typer.Option(help="Dataset ID (use 'list-datasets' to see available options)"),
+        typer.Option(
+            help="Dataset ID (use 'list-datasets' to see available options)",
+            callback=_validate_dataset_id,
+        ),
     ] = "noaa-nbm-conus-forecast",
     output_dir: Annotated[
         Path,
@@ -50,29 +101,51 @@ def update_template(
     ] = Path("./templates"),
 ) -> None:
     """Generate and save a dataset template."""
-    if dataset_id not in DATASETS:
-        console.print(f"[red]Error: Unknown dataset ID '{dataset_id}'[/red]")
-        console.print("Use 'list-datasets' to see available options")
-        raise typer.Exit(1)
+    console = _get_console()
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    dataset = DATASETS[dataset_id]()
+    dataset = _get_dataset(dataset_id)
     template_config = dataset.template_config
 
+    template_path = template_config.template_path(output_dir)
+    fingerprint = template_config.fingerprint()
+
     # Generate template extending 7 days into the future
-    import pandas as pd
+    from datetime import UTC, datetime
+
+    start_time = datetime.now(UTC).replace(minute=0, second=0, microsecond=0)
+
+    # The stored template is only reused while both its structure and its 7-day
+    # window are current; the window moves forward every hour
+    stored_attrs = _read_template_attrs(template_path)
+    if (
+        stored_attrs.get("_template_fingerprint") == fingerprint
+        and stored_attrs.get("_template_window_start") == start_time.isoformat()
+    ):
+        console.print(f"[green]Template up-to-date at {template_path}[/green]")
+        return
 
-    start_time = pd.Timestamp.now(tz="UTC").floor("H")
     template = template_config.get_template(
         append_dim_start=start_time,
         append_dim_periods=7 * 24,  # 7 days of hourly data
-        append_dim_freq="1H",
+        append_dim_freq="1h",
     )
 
-    # Save template
-    template_path = template_config.template_path(output_dir)
-    template.to_zarr(template_path, mode="w", consolidated=True)
+    # Save template metadata and coordinates only (data variables are all NaN),
+    # then consolidate in a single pass over the freshly written keys
+    import zarr
+
+    template.attrs["_template_fingerprint"] = fingerprint
+    template.attrs["_template_window_start"] = start_time.isoformat()
+    template_config.write_metadata(
+        template,
+        template_path,
+        mode="w",
+        consolidated=False,
+        write_empty_chunks=False,
+    )
+    zarr.consolidate_metadata(str(template_path))
 
     console.print(f"[green]Template saved to {template_path}[/green]")
 
@@ -81,7 +154,7 @@ def update_template(
 def operational_update(
     dataset_id: Annotated[
         str,
-        typer.Option(help="Dataset ID to update"),
+        typer.Option(help="Dataset ID to update", callback=_validate_dataset_id),
     ] = "noaa-nbm-conus-forecast",
     output_dir: Annotated[
         Path,
@@ -89,33 +162,31 @@ def operational_update(
     ] = Path("./data"),
 ) -> None:
     """Run an operational update for a dataset."""
+    import logging
     import sys
-    import traceback
 
+    console = _get_console()
+    logger = logging.getLogger(__name__)
     try:
-        if dataset_id not in DATASETS:
-            console.print(f"[red]Error: Unknown dataset ID '{dataset_id}'[/red]")
-            console.print("Use 'list-datasets' to see available options")
-            raise typer.Exit(1)
-
         output_dir.mkdir(parents=True, exist_ok=True)
 
         console.print(f"[cyan]Running operational update for {dataset_id}...[/cyan]")
 
-        # Add detailed logging
-        import logging
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.StreamHandler(sys.stdout),
-                logging.FileHandler('/tmp/nbm_update.log')
-            ]
-        )
-        logger = logging.getLogger(__name__)
+        # Add detailed logging, unless the caller already configured it.
+        # delay=True keeps the log file closed until the first record is written.
+        if not logging.getLogger().handlers:
+            logging.basicConfig(
+                level=logging.INFO,
+                format='%(asctime)s - %(levelname)s - %(message)s',
+                handlers=[
+                    # stderr, so log records don't interleave with the progress output
+                    logging.StreamHandler(sys.stderr),
+                    logging.FileHandler('/tmp/nbm_update.log', delay=True)
+                ]
+            )
 
         logger.info(f"Creating dataset instance for {dataset_id}")
-        dataset = DATASETS[dataset_id]()
+        dataset = _get_dataset(dataset_id)
 
         logger.info(f"Starting operational update to {output_dir}")
         dataset.operational_update(output_dir)
@@ -126,8 +197,9 @@ def operational_update(
         console.print("[yellow]Operation interrupted by user[/yellow]")
         sys.exit(130)
     except Exception as e:
+        # Formats the traceback once and routes it to both the stream and file handlers
+        logger.exception("FATAL ERROR: %s", e)
         console.print(f"[red]FATAL ERROR: {e}[/red]")
-        traceback.print_exc()
         console.print(f"\n[yellow]See /tmp/nbm_update.log for details[/yellow]")
         sys.exit(1)
 
@@ -136,31 +208,39 @@ def operational_update(
 def info(
     dataset_id: Annotated[
         str,
-        typer.Argument(help="Dataset ID to show information for"),
+        typer.Argument(
+            help="Dataset ID to show information for", callback=_validate_dataset_id
+        ),
     ] = "noaa-nbm-conus-forecast",
 ) -> None:
     """Show detailed information about a dataset."""
-    if dataset_id not in DATASETS:
-        console.print(f"[red]Error: Unknown dataset ID '{dataset_id}'[/red]")
-        console.print("Use 'list-datasets' to see available options")
-        raise typer.Exit(1)
+    from rich.table import Table
+
+    console = _get_console()
 
-    dataset = DATASETS[dataset_id]()
-    attrs = dataset.template_config.dataset_attributes
+    template_config = _get_dataset(dataset_id).template_config
+    attrs = template_config.dataset_attributes
+    dimensions = template_config.dimensions
+    data_vars = template_config.data_vars
 
     # Display dataset info
     console.print(f"\n[bold cyan]{attrs.title}[/bold cyan]")
     console.print(f"[dim]{attrs.description}[/dim]\n")
 
-    table = Table(show_header=False, box=None)
+    # Headerless property listing, so a plain grid is enough
+    table = Table.grid(padding=(0, 2))
     table.add_column("Property", style="cyan")
     table.add_column("Value", style="green")
 
-    table.add_row("Dataset ID", attrs.id)
-    table.add_row("Provider", attrs.provider)
-    table.add_row("Model", attrs.model)
-    table.add_row("Variant", attrs.variant)
-    table.add_row("Version", attrs.version)
+    property_rows = [
+        ("Dataset ID", attrs.id),
+        ("Provider", attrs.provider),
+        ("Model", attrs.model),
+        ("Variant", attrs.variant),
+        ("Version", attrs.version),
+    ]
+    for row in property_rows:
+        table.add_row(*row)
 
     console.print(table)
 
@@ -170,7 +250,7 @@ def info(
     dim_table.add_column("Name", style="cyan")
     dim_table.add_column("Size", style="green")
 
-    for dim, size in dataset.template_config.dimensions.items():
+    for dim, size in dimensions.items():
         dim_table.add_row(dim, str(size))
 
     console.print(dim_table)
@@ -181,8 +261,9 @@ def info(
     var_table.add_column("Name", style="cyan")
     var_table.add_column("Description", style="green")
 
-    for var in dataset.template_config.data_vars:
-        var_table.add_row(var.name, var.attrs.get("long_name", ""))
+    var_rows = [(var.name, var.attrs.get("long_name", "")) for var in data_vars]
+    for row in var_rows:
+        var_table.add_row(*row)
 
     console.print(var_table)
 
@@ -1,13 +1,32 @@
 """Base classes for NBM data processing."""
 
-from nbm_to_zarr.base.dataset import Dataset
-from nbm_to_zarr.base.region_job import ProcessingRegion, RegionJob, SourceFileCoord
-from nbm_to_zarr.base.template_config import (
-    CoordinateConfig,
-    DatasetAttributes,
-    DataVariableConfig,
-    TemplateConfig,
-)
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from nbm_to_zarr.base.dataset import Dataset
+    from nbm_to_zarr.base.region_job import ProcessingRegion, RegionJob, SourceFileCoord
+    from nbm_to_zarr.base.template_config import (
+        CoordinateConfig,
+        DatasetAttributes,
+        DataVariableConfig,
+        TemplateConfig,
+    )
+
+# Public names are resolved on first access (PEP 562), so importing this
+# package doesn't pull in xarray/pandas until a class is actually used.
+_LAZY_EXPORTS: dict[str, str] = {
+    "CoordinateConfig": "nbm_to_zarr.base.template_config",
+    "DataVariableConfig": "nbm_to_zarr.base.template_config",
+    "DatasetAttributes": "nbm_to_zarr.base.template_config",
+    "Dataset": "nbm_to_zarr.base.dataset",
+    "ProcessingRegion": "nbm_to_zarr.base.region_job",
+    "RegionJob": "nbm_to_zarr.base.region_job",
+    "SourceFileCoord": "nbm_to_zarr.base.region_job",
+    "TemplateConfig": "nbm_to_zarr.base.template_config",
+}
 
 __all__ = [
     "CoordinateConfig",
@@ -19,3 +38,17 @@ __all__ = [
     "SourceFileCoord",
     "TemplateConfig",
 ]
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    """Import a public class from its submodule on first access."""
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """Include the lazily exported names in `dir()`."""
+    return sorted([*globals(), *__all__])
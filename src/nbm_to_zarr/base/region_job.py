@@ -2,21 +2,43 @@
 
 from __future__ import annotations
 
+import logging
+import queue
+import threading
+import traceback
 from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
 from typing import Any, Generic, TypeVar
 
 import numpy as np
 import pandas as pd
 import xarray as xr
+from rich.progress import MofNCompleteColumn, Progress
 
-from nbm_to_zarr.base.template_config import DataVariableConfig, TemplateConfig
+from nbm_to_zarr.base.template_config import (
+    DEFAULT_ZARR_FORMAT,
+    DataVariableConfig,
+    TemplateConfig,
+)
+
+logger = logging.getLogger(__name__)
+
+# Elements rounded per block by `RegionJob._round_to_n_bits` (256 KiB of float32),
+# small enough for the block and its scratch to stay in cache
+_KEEPBITS_BLOCK_SIZE = 1 << 16
 
 
 class SourceFileCoord(ABC):
     """Abstract base class representing a source file coordinate."""
 
+    # Lets slotted dataclass subclasses avoid a per-instance __dict__
+    __slots__ = ()
+
     @abstractmethod
     def download_url(self) -> str:
         """Return the URL to download the file."""
@@ -43,6 +65,12 @@ DataVarT = TypeVar("DataVarT", bound=DataVariableConfig)
 class RegionJob(ABC, Generic[SourceFileCoordT, DataVarT]):
     """Base class for processing a temporal region of data."""
 
+    # Concurrent downloads and concurrent file reads (decoding and transforming) in
+    # `process()`. As many read files as there are readers may wait for the main
+    # thread, since each holds every variable's field for one forecast hour.
+    MAX_DOWNLOAD_WORKERS = 8
+    MAX_READ_WORKERS = 4
+
     def __init__(
         self,
         template_config: TemplateConfig[DataVarT],
@@ -50,6 +78,7 @@ class RegionJob(ABC, Generic[SourceFileCoordT, DataVarT]):
         data_vars: list[DataVarT],
         output_path: Path,
         download_dir: Path | None = None,
+        zarr_format: int = DEFAULT_ZARR_FORMAT,
     ) -> None:
         """Initialize the region job.
 
@@ -59,6 +88,8 @@ class RegionJob(ABC, Generic[SourceFileCoordT, DataVarT]):
             data_vars: List of data variables to process
             output_path: Path to output Zarr store
             download_dir: Optional directory for downloaded files
+            zarr_format: Zarr format of the store at `output_path`; the template
+                and every region write use it
         """
         self.template_config = template_config
         self.processing_region = processing_region
@@ -66,12 +97,18 @@ class RegionJob(ABC, Generic[SourceFileCoordT, DataVarT]):
         self.output_path = output_path
         self.download_dir = download_dir or Path("/tmp/nbm_downloads")
         self.download_dir.mkdir(parents=True, exist_ok=True)
+        self.zarr_format = zarr_format
 
     @abstractmethod
     def generate_source_file_coords(self) -> list[SourceFileCoordT]:
         """Generate source file coordinates for the processing region."""
         ...
 
+    @cached_property
+    def source_file_coords(self) -> tuple[SourceFileCoordT, ...]:
+        """Return this job's source file coordinates, generated on first access."""
+        return tuple(self.generate_source_file_coords())
+
     @abstractmethod
     def download_file(self, source_coord: SourceFileCoordT) -> Path:
         """Download a file and return the local path."""
@@ -88,33 +125,84 @@ class RegionJob(ABC, Generic[SourceFileCoordT, DataVarT]):
         self, data: dict[str, np.ndarray], var_config: DataVarT
     ) -> dict[str, np.ndarray]:
         """Apply transformations like bit rounding to data arrays."""
+        packed_range = var_config.packed_range
+        if packed_range is not None:
+            # Out-of-range values would wrap around when cast to the packed integer dtype
+            for var_name in data:
+                data[var_name] = np.clip(data[var_name], *packed_range)
         if var_config.keepbits is not None:
             for var_name in data:
-                data[var_name] = self._round_to_n_bits(data[var_name], var_config.keepbits)
+                # Arrays handed in here are owned by the caller, so round them in place
+                data[var_name] = self._round_to_n_bits(
+                    data[var_name], var_config.keepbits, inplace=True
+                )
         return data
 
     @staticmethod
-    def _round_to_n_bits(data: np.ndarray, n_bits: int) -> np.ndarray:
-        """Round data to n significant bits for better compression."""
-        # Implementation of bit rounding algorithm
+    def _round_to_n_bits(data: np.ndarray, n_bits: int, inplace: bool = False) -> np.ndarray:
+        """Round data's mantissa for better compression.
+
+        Keeps `24 - n_bits` significant bits (so `n_bits` of a float32 mantissa are
+        zeroed), as the original frexp-based rounding did. Works on the float's bit
+        pattern: adding half of the dropped range (plus the lowest kept bit, so ties
+        round to even) and masking off the dropped bits rounds to nearest, carrying
+        into the exponent when needed. NaN and inf are left unchanged.
+
+        This matches frexp rounding for normal values only. Subnormals (below
+        `finfo.tiny`) have no implicit leading bit, so dropping a fixed number of
+        bits leaves them fewer significant bits than frexp kept, and the smallest
+        round to zero. No weather field has values that small.
+
+        Args:
+            data: Array to round
+            n_bits: Number of mantissa bits to drop (see above)
+            inplace: Round `data` itself instead of a copy
+        """
         if not np.issubdtype(data.dtype, np.floating):
             return data
 
-        # Handle NaN and inf values
-        mask = np.isfinite(data)
-        if not np.any(mask):
+        finfo = np.finfo(data.dtype)
+        dropped = finfo.nmant + 1 - (24 - n_bits)
+        if dropped <= 0:
             return data
 
-        result = data.copy()
-        finite_data = result[mask]
-
-        # Get mantissa precision
-        mantissa = np.frexp(finite_data)[0]
-        precision = 2.0 ** (n_bits - 24)  # Assuming float32
-
-        # Round to precision
-        rounded = np.around(mantissa / precision) * precision
-        result[mask] = np.ldexp(rounded, np.frexp(finite_data)[1])
+        uint = np.dtype(f"u{data.dtype.itemsize}").type
+        result = data if inplace else np.empty(data.shape, dtype=data.dtype)
+        if data.flags.c_contiguous and result.flags.c_contiguous:
+            # Work through the field in cache-sized blocks, so the kernel's passes
+            # over each block hit cache and the field is only read and written once
+            src, dst = data.reshape(-1), result.reshape(-1)
+            size = _KEEPBITS_BLOCK_SIZE
+            blocks = [(src[i:i + size], dst[i:i + size]) for i in range(0, src.size, size)]
+        else:
+            blocks = [(data, result)]
+
+        half = uint((1 << (dropped - 1)) - 1)
+        keep_mask = ~uint((1 << dropped) - 1)
+        # An all-ones exponent marks NaN and inf
+        exponent_mask = uint(((1 << finfo.nexp) - 1) << finfo.nmant)
+        scratch = np.empty(max((block.size for block, _ in blocks), default=0), dtype=uint)
+
+        for block, out in blocks:
+            bits, out_bits = block.view(uint), out.view(uint)
+            bump = scratch[:bits.size].reshape(bits.shape)
+            np.right_shift(bits, uint(dropped), out=bump)
+            bump &= uint(1)
+            bump += half
+
+            # A sum needs no temporary, and is only non-finite if the block has NaN
+            # or inf (or overflows, which just takes the masked path)
+            with np.errstate(over="ignore"):
+                all_finite = np.isfinite(block.sum())
+            if all_finite:
+                np.add(bits, bump, out=out_bits)
+                out_bits &= keep_mask
+            else:
+                finite = (bits & exponent_mask) != exponent_mask
+                if out_bits is not bits:
+                    np.copyto(out_bits, bits)
+                np.add(out_bits, bump, out=out_bits, where=finite)
+                np.bitwise_and(out_bits, keep_mask, out=out_bits, where=finite)
 
         return result
 
@@ -133,10 +221,65 @@ class RegionJob(ABC, Generic[SourceFileCoordT, DataVarT]):
             }
         raise NotImplementedError("Subclass must override get_indices() method")
 
-    def process(self) -> xr.Dataset:
-        """Process the region and return the populated dataset."""
+    def prepare_template(self, ds: xr.Dataset) -> xr.Dataset:
+        """Adjust the template before any source file is processed.
+
+        Called once by `process()`, before the template is written or filled.
+        The default sets an hourly lead_time coordinate; subclasses override this
+        to set coordinates that come from the source files.
+        """
+        # Create lead_time coordinate values (0-36 hours)
+        # Note: f000 often doesn't exist, so lead_time[0] will remain NaN
+        lead_times = pd.to_timedelta(np.arange(self.template_config.dimensions['lead_time']), unit='h')
+        return ds.assign_coords(lead_time=lead_times)
+
+    def close(self) -> None:
+        """Release resources held for processing; called when `process()` finishes."""
+
+    def _read_source_file(
+        self, file_path: Path, source_coord: SourceFileCoordT
+    ) -> dict[str, np.ndarray]:
+        """Read a source file and apply each variable's transformations.
+
+        Runs on the reader threads of `process()`, so decoding and bit rounding
+        for different files proceed in parallel.
+        """
+        result = self.read_data(file_path, source_coord)
+
+        # Handle backward compatibility
+        if isinstance(result, tuple):
+            data_dict, metadata = result
+        else:
+            data_dict = result
+            metadata = {}
+
+        for var_config in self.data_vars:
+            if var_config.name in data_dict:
+                data_dict.update(
+                    self.apply_transformations(
+                        {var_config.name: data_dict[var_config.name]}, var_config
+                    )
+                )
+        return data_dict
+
+    def process(self, progressive: bool = False) -> xr.Dataset:
+        """Process the region and return the populated dataset.
+
+        Args:
+            progressive: Write the template to `output_path` up front, then write
+                each init time into it as soon as all of its files are processed.
+                Only the init times still being filled are held in memory, and the
+                returned dataset is opened lazily from `output_path`.
+        """
+        try:
+            return self._process(progressive)
+        finally:
+            self.close()
+
+    def _process(self, progressive: bool) -> xr.Dataset:
+        """Run `process()`; split out so `close()` runs however it ends."""
         # Generate source file coordinates
-        source_coords = self.generate_source_file_coords()
+        source_coords = self.source_file_coords
 
         # Create dimension coordinates
         init_times = pd.date_range(
@@ -146,95 +289,236 @@ class RegionJob(ABC, Generic[SourceFileCoordT, DataVarT]):
             tz="UTC",
         )
 
-        print(f"DEBUG process(): init_times={init_times}")
-        print(f"DEBUG process(): init_times[0]={init_times[0]}, type={type(init_times[0])}")
+        logger.debug("process(): %d init times starting %s", len(init_times), init_times[0])
 
         # Build empty dataset
         ds = self.template_config.get_template(
             append_dim_start=init_times[0],
             append_dim_periods=len(init_times),
             append_dim_freq="1h",
+            zarr_format=self.zarr_format,
         )
 
-        print(f"DEBUG process(): ds.init_time.values={ds.init_time.values}")
-        print(f"DEBUG process(): ds.init_time.values[0]={ds.init_time.values[0]}, dtype={ds.init_time.values.dtype}")
+        logger.debug(
+            "process(): template init_time dtype=%s len=%d", ds.init_time.dtype, ds.init_time.size
+        )
 
-        # Create lead_time coordinate values (0-36 hours)
-        # Note: f000 often doesn't exist, so lead_time[0] will remain NaN
-        lead_times = pd.to_timedelta(np.arange(self.template_config.dimensions['lead_time']), unit='h')
-        ds = ds.assign_coords(lead_time=lead_times)
+        ds = self.prepare_template(ds)
 
         print(f"Processing {len(source_coords)} source files...")
         print(f"Total data to download: ~{len(source_coords) * 150 / 1024:.1f} GB")
 
-        # Process each source file
-        processed_count = 0
-        for idx, source_coord in enumerate(source_coords, 1):
-            try:
-                # Download file
-                print(f"[{idx}/{len(source_coords)}] Downloading: {source_coord.download_url()}")
-                file_path = self.download_file(source_coord)
-
-                # Read data
-                result = self.read_data(file_path, source_coord)
-
-                # Handle backward compatibility
-                if isinstance(result, tuple):
-                    data_dict, metadata = result
-                else:
-                    data_dict = result
-                    metadata = {}
-
-                # Get indices for this source coordinate
-                indices = self.get_indices(source_coord)
-                init_time = indices['init_time']
-                forecast_hour = indices['forecast_hour']
-
-                # Normalize init_time to timezone-naive for comparison
-                # (dataset coords are timezone-naive after Zarr conversion)
-                if isinstance(init_time, pd.Timestamp) and init_time.tz is not None:
-                    init_time_naive = init_time.tz_localize(None).to_datetime64()
-                elif hasattr(init_time, 'tz') and init_time.tz is not None:
-                    init_time_naive = pd.Timestamp(init_time).tz_localize(None).to_datetime64()
-                else:
-                    init_time_naive = np.datetime64(init_time, 'ns')
-
-                # Find the init_time index
-                init_idx = np.where(ds.init_time.values == init_time_naive)[0]
-                if len(init_idx) == 0:
-                    print(f"Warning: init_time {init_time} not found in dataset")
-                    print(f"  Tried to match: {init_time_naive}")
-                    print(f"  Available times: {ds.init_time.values}")
-                    continue
-                init_idx = init_idx[0]
-
-                # Apply transformations and populate dataset
-                for var_config in self.data_vars:
-                    if var_config.name in data_dict:
-                        transformed_data = self.apply_transformations(
-                            {var_config.name: data_dict[var_config.name]}, var_config
-                        )
-
-                        # Populate the dataset with the data at the correct indices
-                        # forecast_hour is 1-36, maps directly to lead_time indices 1-36
-                        # (index 0 is 0h/f000 which we skip, so it remains NaN)
-                        data_array = transformed_data[var_config.name]
-                        ds[var_config.name].values[init_idx, forecast_hour, :, :] = data_array
-
-                processed_count += 1
-                # Report progress more frequently for long downloads
-                if processed_count % 5 == 0 or processed_count == len(source_coords):
-                    pct = (processed_count / len(source_coords)) * 100
-                    print(f"✅ Progress: {processed_count}/{len(source_coords)} files ({pct:.1f}%)")
+        # Dataset coords are timezone-naive, so source init times are normalized
+        # once to look up their index
+        init_index = self._init_time_index(ds)
+        files_remaining = Counter(
+            init_index.get(self._init_time_key(self.get_indices(c)['init_time']))
+            for c in source_coords
+        )
+
+        # Data is collected in numpy buffers and swapped into the (lazy) template at
+        # the end; writing through `ds[name].values` would only modify a copy.
+        # Template variables that aren't processed stay lazy, so the full template
+        # is never materialized in memory. Progressive runs instead allocate one
+        # slab per init time when its first file arrives, and write and drop it
+        # once the last one is done.
+        if progressive:
+            self._write_zarr_template(ds)
+            buffers = {}
+        else:
+            buffers = {
+                var_config.name: np.full(
+                    ds[var_config.name].shape, np.nan, dtype=ds[var_config.name].dtype
+                )
+                for var_config in self.data_vars
+            }
+        slabs: dict[int, dict[str, np.ndarray]] = {}
+        if not progressive:
+            # Views of each init time's buffers are taken once, rather than per file
+            slabs = {
+                init_idx: {var_name: buffer[init_idx] for var_name, buffer in buffers.items()}
+                for init_idx in range(ds.sizes['init_time'])
+            }
 
+        def get_slab(init_idx: int) -> dict[str, np.ndarray]:
+            """Return (lead_time, y, x) arrays for each processed variable at init_idx."""
+            if not progressive:
+                return slabs[init_idx]
+            if init_idx not in slabs:
+                slabs[init_idx] = {
+                    var_config.name: np.full(
+                        ds[var_config.name].shape[1:], np.nan, dtype=ds[var_config.name].dtype
+                    )
+                    for var_config in self.data_vars
+                }
+            return slabs[init_idx]
+
+        # Downloads run on one pool and hand each finished file to a pool of
+        # readers, which decode and transform it. Results go through a bounded
+        # queue to this thread, which is the only one writing into the buffers;
+        # readers wait while it's full, so at most twice MAX_READ_WORKERS decoded
+        # files are held in memory at once.
+        results: queue.Queue[tuple[SourceFileCoordT, Any, BaseException | None]] = (
+            queue.Queue(maxsize=self.MAX_READ_WORKERS)
+        )
+        download_executor = ThreadPoolExecutor(max_workers=self.MAX_DOWNLOAD_WORKERS)
+        read_executor = ThreadPoolExecutor(max_workers=self.MAX_READ_WORKERS)
+
+        stop = threading.Event()
+
+        def read_file(source_coord: SourceFileCoordT, download: Future[Path]) -> None:
+            # Every file posts exactly one result, even if its reader dies from a
+            # BaseException, so this thread never waits for one that won't come
+            item = (source_coord, None, RuntimeError(f"Reading {source_coord} was interrupted"))
+            try:
+                item = (source_coord, self._read_source_file(download.result(), source_coord), None)
             except Exception as e:
-                print(f"Error processing {source_coord}: {e}")
-                import traceback
-                traceback.print_exc()
-                continue
+                item = (source_coord, None, e)
+            finally:
+                # Give up if this thread stopped consuming, so shutdown never waits
+                # on a reader blocked by a full queue
+                while not stop.is_set():
+                    try:
+                        results.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+
+        def start_read(source_coord: SourceFileCoordT) -> Callable[[Future[Path]], None]:
+            return lambda download: read_executor.submit(read_file, source_coord, download)
+
+        processed_count = 0
+        # Around 20 progress lines per job, however many files it has
+        progress_every = max(1, len(source_coords) // 20)
+        debug = logger.isEnabledFor(logging.DEBUG)
+        progress = Progress(*Progress.get_default_columns(), MofNCompleteColumn())
+        progress_task = progress.add_task("Source files", total=len(source_coords))
+        try:
+            for idx, source_coord in enumerate(source_coords, 1):
+                if debug:
+                    logger.debug("[%d/%d] Downloading: %s", idx, len(source_coords), source_coord.download_url())
+                download = download_executor.submit(self.download_file, source_coord)
+                download.add_done_callback(start_read(source_coord))
+
+            with progress:
+                for _ in range(len(source_coords)):
+                    source_coord, data_dict, error = results.get()
+                    progress.advance(progress_task)
+
+                    # Get indices for this source coordinate
+                    indices = self.get_indices(source_coord)
+                    init_time = indices['init_time']
+                    forecast_hour = indices['forecast_hour']
+                    init_time_naive = self._naive_datetime64(init_time)
+                    init_idx = init_index.get(self._init_time_key(init_time_naive))
+
+                    try:
+                        if error is not None:
+                            raise error
+
+                        if init_idx is None:
+                            print(f"Warning: init_time {init_time} not found in dataset")
+                            print(f"  Tried to match: {init_time_naive}")
+                            print(f"  Available times: {ds.init_time.values}")
+                            continue
+
+                        # Populate the dataset at the correct indices; forecast_hour is
+                        # the lead_time index (mapped by get_indices)
+                        slab = get_slab(init_idx)
+                        for var_config in self.data_vars:
+                            if var_config.name in data_dict:
+                                slab[var_config.name][forecast_hour] = data_dict[var_config.name]
+
+                        processed_count += 1
+                        # The bar only renders on a terminal, so keep periodic progress
+                        # lines for logs of long non-interactive runs
+                        if not progress.console.is_terminal and (
+                            processed_count % progress_every == 0
+                            or processed_count == len(source_coords)
+                        ):
+                            pct = (processed_count / len(source_coords)) * 100
+                            print(
+                                f"✅ Progress: {processed_count}/{len(source_coords)} files "
+                                f"({pct:.1f}%)"
+                            )
+
+                    except Exception as e:
+                        print(f"Error processing {source_coord}: {e}")
+                        traceback.print_exception(e)
+                        continue
+
+                    finally:
+                        # Write out an init time once none of its files are outstanding
+                        files_remaining[init_idx] -= 1
+                        if progressive and files_remaining[init_idx] == 0 and init_idx in slabs:
+                            self._write_init_time_slab(ds, init_idx, slabs.pop(init_idx))
+        finally:
+            stop.set()
+            download_executor.shutdown(wait=True, cancel_futures=True)
+            read_executor.shutdown(wait=True, cancel_futures=True)
 
         print(f"Successfully processed {processed_count}/{len(source_coords)} files")
-        return ds
+
+        if progressive:
+            return xr.open_zarr(self.output_path)
+
+        return ds.assign(
+            {var_name: ds[var_name].copy(data=buffer) for var_name, buffer in buffers.items()}
+        )
+
+    def _write_zarr_template(self, ds: xr.Dataset) -> None:
+        """Write the dataset's coordinates and array metadata to `output_path`.
+
+        No data variable chunks are written; `_write_init_time_slab` fills them in.
+        """
+        print(f"Writing template to {self.output_path} for progressive writes...")
+        self.template_config.write_metadata(
+            ds, self.output_path, zarr_format=self.zarr_format, mode="w", consolidated=True
+        )
+
+    def _write_init_time_slab(
+        self, ds: xr.Dataset, init_idx: int, slab: dict[str, np.ndarray]
+    ) -> None:
+        """Write one init time's processed variables into the template at `output_path`.
+
+        Variables are chunked one init time per chunk, so the region covers whole
+        chunks and slabs for different init times never share one.
+        """
+        slab_ds = xr.Dataset(
+            {
+                var_name: (ds[var_name].dims, data[np.newaxis])
+                for var_name, data in slab.items()
+            }
+        )
+        slab_ds.to_zarr(
+            self.output_path,
+            region={"init_time": slice(init_idx, init_idx + 1)},
+            mode="r+",
+            zarr_format=self.zarr_format,
+        )
+        logger.debug("Wrote init_time index %d to %s", init_idx, self.output_path)
+
+    @staticmethod
+    def _naive_datetime64(init_time: pd.Timestamp) -> np.datetime64:
+        """Return init_time as timezone-naive datetime64[ns].
+
+        Dataset coords are timezone-naive after Zarr conversion, so source coordinate
+        init times are normalized to match them.
+        """
+        if getattr(init_time, 'tz', None) is not None:
+            return pd.Timestamp(init_time).tz_localize(None).to_datetime64().astype('datetime64[ns]')
+        return np.datetime64(init_time, 'ns')
+
+    @classmethod
+    def _init_time_key(cls, init_time: pd.Timestamp | np.datetime64) -> int:
+        """Return init_time as integer nanoseconds, the key used by `_init_time_index`."""
+        return int(cls._naive_datetime64(init_time).view('i8'))
+
+    @staticmethod
+    def _init_time_index(ds: xr.Dataset) -> dict[int, int]:
+        """Map each of ds's init times, as integer nanoseconds, to its index."""
+        keys = ds.init_time.values.astype('datetime64[ns]').view('i8')
+        return dict(zip(keys.tolist(), range(len(keys))))
 
     @classmethod
     @abstractmethod
@@ -2,20 +2,46 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
+import logging
 from abc import ABC, abstractmethod
-from datetime import timedelta
+from collections.abc import Callable, Mapping
+from datetime import datetime, timedelta
+from functools import cached_property, lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any, Generic, TypeVar
 
+import numcodecs
 import numpy as np
 import pandas as pd
 import xarray as xr
-from pydantic import BaseModel
+import zarr
+from pandas.tseries.frequencies import to_offset
+from pandas.tseries.offsets import BaseOffset, Tick
+from pydantic import BaseModel, field_validator
+
+logger = logging.getLogger(__name__)
+
+# Lazy templates kept per TemplateConfig instance by get_template
+_TEMPLATE_CACHE_SIZE = 16
+
+# Zarr format datasets are written in unless a caller asks otherwise. Stores stay
+# Zarr v2 with consolidated `.zmetadata`, which the update workflow and the
+# scripts under scripts/ read directly.
+DEFAULT_ZARR_FORMAT = 2
+
+# Parsing a frequency string costs more than generating a week of hourly times,
+# and only a handful of distinct frequencies are ever used
+_to_offset = lru_cache(maxsize=None)(to_offset)
 
 
 class CoordinateConfig(BaseModel):
     """Configuration for a coordinate variable."""
 
+    model_config = {"frozen": True}
+
     name: str
     dtype: str = "float64"
     chunks: dict[str, int] | None = None
@@ -27,18 +53,96 @@ class CoordinateConfig(BaseModel):
 class DataVariableConfig(BaseModel):
     """Configuration for a data variable."""
 
+    model_config = {"frozen": True}
+
     name: str
     dtype: str = "float32"
     chunks: dict[str, int] | None = None
+    # Zarr v3 shard shape; each shard stores a block of whole `chunks` as one object
+    shards: dict[str, int] | None = None
     compressor: str = "zstd"
     compressor_level: int = 3
+    # Run the compressor inside Blosc with byte shuffling, which groups the bytes
+    # of each value by significance; neighbouring values in weather fields share
+    # their high bytes, so this compresses them much better
+    shuffle: bool = True
+    # Shuffle bits rather than bytes. Smooth, densely populated packed integers
+    # (e.g. percentages) compress better this way, and 1-byte dtypes can only be
+    # shuffled at bit level; float fields do slightly better with byte shuffle
+    bitshuffle: bool = False
     keepbits: int | None = None
+    # CF integer packing for bounded variables: stored as `packed_dtype` holding
+    # round((value - add_offset) / scale_factor), with NaN mapped to the dtype's max.
+    # Zarr keeps scale_factor/add_offset as JSON floats, so xarray decodes variables
+    # that set either as float64; with neither, 1- and 2-byte packing reads as float32
+    packed_dtype: str | None = None
+    scale_factor: float = 1.0
+    add_offset: float = 0.0
     attrs: dict[str, Any] = {}
 
+    # Derived values are cached on the (frozen) instance: they are read for every
+    # template build and every processed file
+
+    @cached_property
+    def encoding(self) -> Mapping[str, Any]:
+        """Return the xarray encoding that packs this variable, if any."""
+        if self.packed_dtype is None:
+            return MappingProxyType({})
+        encoding: dict[str, Any] = {
+            "dtype": self.packed_dtype,
+            "_FillValue": np.iinfo(self.packed_dtype).max,
+        }
+        # Identity scaling is left out so it doesn't change the decoded dtype
+        if self.scale_factor != 1.0:
+            encoding["scale_factor"] = self.scale_factor
+        if self.add_offset != 0.0:
+            encoding["add_offset"] = self.add_offset
+        return MappingProxyType(encoding)
+
+    def compressor_encoding(self, zarr_format: int) -> dict[str, Any]:
+        """Return the encoding entry selecting this variable's compressor."""
+        if zarr_format >= 3:
+            if self.shuffle:
+                codec = {
+                    "name": "blosc",
+                    "configuration": {
+                        "cname": self.compressor,
+                        "clevel": self.compressor_level,
+                        "shuffle": "bitshuffle" if self.bitshuffle else "shuffle",
+                    },
+                }
+            else:
+                codec = {"name": self.compressor, "configuration": {"level": self.compressor_level}}
+            return {"compressors": (codec,)}
+
+        if self.shuffle:
+            compressor = numcodecs.Blosc(
+                cname=self.compressor,
+                clevel=self.compressor_level,
+                shuffle=numcodecs.Blosc.BITSHUFFLE if self.bitshuffle else numcodecs.Blosc.SHUFFLE,
+            )
+        else:
+            compressor = numcodecs.get_codec({"id": self.compressor, "level": self.compressor_level})
+        # zarr-python 3 takes a tuple of codecs for format 2 stores too
+        if hasattr(zarr, "config"):
+            return {"compressors": (compressor,)}
+        return {"compressor": compressor}
+
+    @cached_property
+    def packed_range(self) -> tuple[float, float] | None:
+        """Return the (min, max) values representable by the packed dtype."""
+        if self.packed_dtype is None:
+            return None
+        # The dtype's max is reserved for the fill value
+        top = np.iinfo(self.packed_dtype).max - 1
+        return self.add_offset, self.add_offset + top * self.scale_factor
+
 
 class DatasetAttributes(BaseModel):
     """Dataset-level metadata attributes."""
 
+    model_config = {"frozen": True}
+
     id: str
     title: str
     description: str
@@ -52,13 +156,25 @@ DataVarT = TypeVar("DataVarT", bound=DataVariableConfig)
 
 
 class TemplateConfig(ABC, BaseModel, Generic[DataVarT]):
-    """Base class for dataset template configuration."""
+    """Base class for dataset template configuration.
 
-    model_config = {"arbitrary_types_allowed": True}
+    Subclasses should implement the abstract properties with
+    `functools.cached_property` so each is computed once per instance, and
+    `dimension_coordinates` should hand out configs built once rather than
+    construct new ones per call.
+    """
 
-    dimensions: dict[str, int]
+    model_config = {"arbitrary_types_allowed": True, "validate_default": True}
+
+    dimensions: Mapping[str, int]
     append_dim: str
 
+    @field_validator("dimensions", mode="after")
+    @classmethod
+    def _freeze_dimensions(cls, value: Mapping[str, int]) -> Mapping[str, int]:
+        """Store dimensions as a read-only view so callers can't mutate shared state."""
+        return MappingProxyType(dict(value))
+
     @property
     @abstractmethod
     def dataset_attributes(self) -> DatasetAttributes:
@@ -88,21 +204,141 @@ class TemplateConfig(ABC, BaseModel, Generic[DataVarT]):
         ...
 
     def append_dim_coordinates(
-        self, start: pd.Timestamp, periods: int, freq: str | timedelta
+        self, start: pd.Timestamp | datetime, periods: int, freq: str | timedelta | BaseOffset
     ) -> pd.DatetimeIndex:
         """Generate DatetimeIndex for the append dimension."""
-        # Ensure timezone is preserved
-        result = pd.date_range(start=start, periods=periods, freq=freq, tz='UTC')
-        print(f"DEBUG append_dim_coordinates: start={start}, result[0]={result[0]}")
+        offset = _to_offset(freq)
+        if isinstance(offset, Tick):
+            # Fixed steps (hours, minutes, ...) are plain nanosecond arithmetic, which
+            # skips date_range's generic offset handling. The result is always in
+            # nanoseconds, the resolution templates store init times in.
+            start = pd.Timestamp(start)
+            start = start.tz_localize('UTC') if start.tz is None else start.tz_convert('UTC')
+            values = start.as_unit('ns').value + np.arange(periods, dtype=np.int64) * offset.nanos
+            result = pd.DatetimeIndex(values.view('datetime64[ns]')).tz_localize('UTC')
+        else:
+            # Ensure timezone is preserved
+            result = pd.date_range(start=start, periods=periods, freq=offset, tz='UTC')
+        logger.debug("append_dim_coordinates: start=%s periods=%d", start, periods)
         return result
 
+    @staticmethod
+    def load_lazy_coords(ds: xr.Dataset) -> xr.Dataset:
+        """Compute any dask-backed coordinates.
+
+        `to_zarr(compute=False)` defers every dask array, coordinates included, so
+        lazily derived coordinates must be loaded before writing a template.
+        """
+        lazy = {name: coord.compute() for name, coord in ds.coords.items() if coord.chunks}
+        return ds.assign_coords(lazy) if lazy else ds
+
+    @classmethod
+    def write_metadata(
+        cls,
+        ds: xr.Dataset,
+        store: Path | str,
+        zarr_format: int = DEFAULT_ZARR_FORMAT,
+        **to_zarr_kwargs: Any,
+    ) -> None:
+        """Write a template's coordinates and array metadata, but no data variable chunks.
+
+        `to_zarr(compute=False)` still builds, optimizes and discards a dask store
+        graph with a task per chunk, which is most of a template write. Each data
+        variable is swapped for a single-chunk placeholder first, so the graph is
+        trivial; dtype, attrs and encoding (and so the Zarr chunking) are unchanged.
+
+        Args:
+            ds: Template to write
+            store: Destination store
+            zarr_format: Zarr format to write; must match the one `ds` was built for
+            **to_zarr_kwargs: Passed on to `to_zarr`, e.g. `mode` or `consolidated`
+        """
+        import dask.array as da
+
+        placeholders: dict[tuple[Any, ...], da.Array] = {}
+        data_vars = {}
+        for name, variable in ds.data_vars.items():
+            key = (variable.shape, variable.dtype)
+            if key not in placeholders:
+                placeholders[key] = da.empty(variable.shape, dtype=variable.dtype, chunks=-1)
+            data_vars[name] = variable.variable.copy(deep=False, data=placeholders[key])
+        ds = cls.load_lazy_coords(ds.assign(data_vars))
+        ds.to_zarr(store, compute=False, zarr_format=zarr_format, **to_zarr_kwargs)
+
     def get_template(
         self,
-        append_dim_start: pd.Timestamp,
+        append_dim_start: pd.Timestamp | datetime,
         append_dim_periods: int,
         append_dim_freq: str | timedelta,
+        lazy: bool = True,
+        zarr_format: int = DEFAULT_ZARR_FORMAT,
+    ) -> xr.Dataset:
+        """Create an empty xarray Dataset template with proper structure.
+
+        Lazy templates are cached per (start, periods, freq, format), and each call
+        gets a shallow copy, so callers may assign to it or change attrs and
+        encoding without affecting later calls.
+
+        Args:
+            append_dim_start: First value of the append dimension
+            append_dim_periods: Length of the append dimension
+            append_dim_freq: Spacing of the append dimension
+            lazy: Back data variables and derived coordinates with dask. With False
+                they are allocated as NaN-filled numpy arrays, which avoids dask
+                overhead for small regions held in memory; the on-disk chunking
+                is kept in each variable's encoding either way.
+            zarr_format: Zarr format the template will be written in. Selects the
+                compressor encoding, and shards are only set for format 3.
+        """
+        if not lazy:
+            # Numpy-backed templates are filled in place by callers, so never shared
+            return self._build_template(
+                append_dim_start, append_dim_periods, append_dim_freq,
+                lazy=False, zarr_format=zarr_format,
+            )
+        # Normalized so equivalent arguments (e.g. "1h" and timedelta(hours=1)) share
+        # an entry
+        template = self._cached_template(
+            pd.Timestamp(append_dim_start), append_dim_periods, _to_offset(append_dim_freq),
+            zarr_format=zarr_format,
+        )
+        return template.copy(deep=False)
+
+    @cached_property
+    def _dataset_attrs(self) -> Mapping[str, Any]:
+        """Return `dataset_attributes` as template attrs, serialized once per instance."""
+        return MappingProxyType(self.dataset_attributes.model_dump())
+
+    @cached_property
+    def _dimension_coordinate_vars(self) -> Mapping[str, tuple[str, np.ndarray, dict[str, Any]]]:
+        """Return each non-append dimension coordinate as a `(dim, values, attrs)` tuple.
+
+        Built once per instance from `dimension_coordinates`, with read-only
+        placeholder values, so every template shares them.
+        """
+        coord_vars = {}
+        for coord_config in self.dimension_coordinates():
+            if coord_config.name == self.append_dim:
+                continue
+            values = np.arange(self.dimensions[coord_config.name], dtype=coord_config.dtype)
+            values.flags.writeable = False
+            coord_vars[coord_config.name] = (coord_config.name, values, coord_config.attrs)
+        return MappingProxyType(coord_vars)
+
+    @cached_property
+    def _cached_template(self) -> Callable[..., xr.Dataset]:
+        """Return `_build_template` behind an LRU cache owned by this instance."""
+        return lru_cache(maxsize=_TEMPLATE_CACHE_SIZE)(self._build_template)
+
+    def _build_template(
+        self,
+        append_dim_start: pd.Timestamp | datetime,
+        append_dim_periods: int,
+        append_dim_freq: str | timedelta | BaseOffset,
+        lazy: bool = True,
+        zarr_format: int = DEFAULT_ZARR_FORMAT,
     ) -> xr.Dataset:
-        """Create an empty xarray Dataset template with proper structure."""
+        """Build a template; see `get_template`."""
         import dask.array as da
 
         # Create append dimension coordinates
@@ -113,15 +349,7 @@ class TemplateConfig(ABC, BaseModel, Generic[DataVarT]):
         )
 
         # Create dimension coordinates
-        coords_dict: dict[str, Any] = {self.append_dim: append_coords}
-        for coord_config in self.dimension_coordinates():
-            if coord_config.name == self.append_dim:
-                continue
-            coords_dict[coord_config.name] = (
-                coord_config.name,
-                np.arange(self.dimensions[coord_config.name], dtype=coord_config.dtype),
-                coord_config.attrs,
-            )
+        coords_dict: dict[str, Any] = {self.append_dim: append_coords, **self._dimension_coordinate_vars}
 
         # Create dataset with dimension coordinates
         ds = xr.Dataset(coords=coords_dict)
@@ -129,30 +357,109 @@ class TemplateConfig(ABC, BaseModel, Generic[DataVarT]):
         # Derive additional coordinates
         ds = self.derive_coordinates(ds)
 
-        # Create data variables using dask arrays (lazy, not materialized in memory)
+        # Create data variables using dask arrays (lazy, not materialized in memory).
+        # Variables sharing a shape, dtype and chunking share one (immutable) dask
+        # array, since building and tokenizing each graph is most of the cost, and all
+        # are added to the dataset in a single merge.
+        lazy_arrays: dict[tuple[Any, ...], da.Array] = {}
+        data_vars: dict[str, xr.Variable] = {}
+        # Variables usually share one chunk/shard layout, so each distinct layout's
+        # dims, shape and chunking are worked out once
+        layouts: dict[tuple[Any, ...], tuple[Any, ...]] = {}
+        dimensions = self.dimensions
         for var_config in self.data_vars:
-            chunks = var_config.chunks or {dim: size for dim, size in self.dimensions.items()}
-            shape = tuple(self.dimensions.get(dim, len(coords_dict[dim])) for dim in chunks.keys())
-            chunk_sizes = tuple(chunks.get(dim, self.dimensions.get(dim, len(coords_dict[dim]))) for dim in chunks.keys())
-
-            # Use dask to create a lazy array filled with NaN
-            dask_array = da.full(
-                shape,
-                np.nan,
-                dtype=var_config.dtype,
-                chunks=chunk_sizes,
+            layout_key = (
+                tuple(var_config.chunks.items()) if var_config.chunks is not None else None,
+                tuple(var_config.shards.items()) if var_config.shards is not None else None,
             )
-
-            ds[var_config.name] = xr.DataArray(
-                data=dask_array,
-                dims=list(chunks.keys()),
-                attrs=var_config.attrs,
+            layout = layouts.get(layout_key)
+            if layout is None:
+                chunks = var_config.chunks or {dim: size for dim, size in dimensions.items()}
+                # The append dimension's length comes from the requested periods, not the
+                # nominal size in `dimensions`
+                shape = tuple(
+                    len(append_coords) if dim == self.append_dim
+                    else dimensions.get(dim, len(coords_dict[dim]))
+                    for dim in chunks.keys()
+                )
+                chunk_sizes = tuple(chunks.get(dim, dimensions.get(dim, len(coords_dict[dim]))) for dim in chunks.keys())
+
+                # Chunks are clipped to the array so the encoding is valid for any
+                # append_dim_periods
+                chunk_sizes = tuple(map(min, chunk_sizes, shape))
+                layout_encoding = {"chunks": chunk_sizes}
+                if var_config.shards is not None and zarr_format >= 3:
+                    # Shards must hold whole chunks, so round each shard up to a multiple of
+                    # the chunk, and give dask one chunk per shard so parallel writes never
+                    # share a shard
+                    shard_sizes = tuple(
+                        min(var_config.shards.get(dim, chunk), -(-size // chunk) * chunk)
+                        for dim, chunk, size in zip(chunks, chunk_sizes, shape, strict=True)
+                    )
+                    layout_encoding["shards"] = shard_sizes
+                    chunk_sizes = shard_sizes
+                layout = layouts[layout_key] = (tuple(chunks.keys()), shape, chunk_sizes, layout_encoding)
+            var_dims, shape, chunk_sizes, layout_encoding = layout
+
+            encoding = {
+                **var_config.encoding,
+                **var_config.compressor_encoding(zarr_format),
+                **layout_encoding,
+            }
+
+            if lazy:
+                # Use dask to create a lazy array filled with NaN
+                key = (shape, np.dtype(var_config.dtype), chunk_sizes)
+                data = lazy_arrays.get(key)
+                if data is None:
+                    data = lazy_arrays[key] = da.full(
+                        shape,
+                        np.nan,
+                        dtype=var_config.dtype,
+                        chunks=chunk_sizes,
+                    )
+            else:
+                # Callers fill these in place, so each variable gets its own
+                data = np.full(shape, np.nan, dtype=var_config.dtype)
+
+            data_vars[var_config.name] = xr.Variable(
+                var_dims, data, attrs=var_config.attrs, encoding=encoding
             )
+        ds = ds.assign(data_vars)
 
         # Add dataset attributes
-        ds.attrs.update(self.dataset_attributes.model_dump())
-
-        return ds
+        ds.attrs.update(self._dataset_attrs)
+
+        return ds if lazy else self.load_lazy_coords(ds)
+
+    def fingerprint(self, zarr_format: int = DEFAULT_ZARR_FORMAT) -> str:
+        """Return a short hash of the template structure and encoding.
+
+        Covers dimension sizes, the dataset version, the Zarr format and each data
+        variable's full config and resulting encoding (chunks, shards, keepbits,
+        packing and compressor), so a stored template can be recognised as up to
+        date without rewriting it. The append dimension's window is not included;
+        callers check that separately.
+        """
+        payload = json.dumps(
+            {
+                "dims": sorted(self.dimensions.items()),
+                "version": self.dataset_attributes.version,
+                "zarr_format": zarr_format,
+                "vars": [
+                    {
+                        "config": var.model_dump(mode="json"),
+                        "encoding": dict(var.encoding),
+                        "compressor": var.compressor_encoding(zarr_format),
+                    }
+                    for var in sorted(self.data_vars, key=lambda var: var.name)
+                ],
+            },
+            sort_keys=True,
+            # numcodecs codecs have a stable repr of their full configuration
+            default=repr,
+        )
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
 
     def template_path(self, output_dir: Path) -> Path:
         """Return the path where the template should be saved."""
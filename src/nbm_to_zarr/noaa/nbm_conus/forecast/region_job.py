@@ -2,20 +2,34 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+import logging
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from functools import cached_property, lru_cache
 from pathlib import Path
+from types import MappingProxyType
 
 import numpy as np
 import pandas as pd
 import rasterio
 import requests
+import xarray as xr
+from numcodecs import Blosc
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from nbm_to_zarr.base.region_job import ProcessingRegion, RegionJob, SourceFileCoord
 from nbm_to_zarr.base.template_config import DataVariableConfig, TemplateConfig
+from nbm_to_zarr.noaa.nbm_conus.forecast.template_config import FORECAST_HOURS
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+
+@dataclass(slots=True)
 class NbmConusSourceFileCoord(SourceFileCoord):
     """Coordinate representing a single NBM CONUS forecast file."""
 
@@ -23,21 +37,31 @@ class NbmConusSourceFileCoord(SourceFileCoord):
     forecast_hour: int
     region: str = "co"  # CONUS region code
 
+    # Derived once in __post_init__; thousands of coords are built per job and
+    # their URLs and filenames are asked for repeatedly
+    date_str: str = field(init=False, repr=False, compare=False)
+    cycle_str: str = field(init=False, repr=False, compare=False)
+    filename: str = field(init=False, repr=False, compare=False)
+    _url: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.date_str = self.init_time.strftime("%Y%m%d")
+        self.cycle_str = self.init_time.strftime("%H")
+        self.filename = (
+            f"blend.t{self.cycle_str}z.core.f{self.forecast_hour:03d}.{self.region}.grib2"
+        )
+        self._url = (
+            f"https://nomads.ncep.noaa.gov/pub/data/nccf/com/blend/prod/"
+            f"blend.{self.date_str}/{self.cycle_str}/core/{self.filename}"
+        )
+
     def download_url(self) -> str:
         """Return the NOMADS download URL for this file.
 
         Format: https://nomads.ncep.noaa.gov/pub/data/nccf/com/blend/prod/
                 blend.YYYYMMDD/HH/core/blend.tHHz.core.fXXX.co.grib2
         """
-        date_str = self.init_time.strftime("%Y%m%d")
-        cycle_str = self.init_time.strftime("%H")
-        forecast_str = f"{self.forecast_hour:03d}"
-
-        return (
-            f"https://nomads.ncep.noaa.gov/pub/data/nccf/com/blend/prod/"
-            f"blend.{date_str}/{cycle_str}/core/"
-            f"blend.t{cycle_str}z.core.f{forecast_str}.{self.region}.grib2"
-        )
+        return self._url
 
     def index_url(self) -> str:
         """Return the index file URL."""
@@ -64,11 +88,16 @@ class NbmConusForecastRegionJob(RegionJob[NbmConusSourceFileCoord, DataVariableC
 
         Note: Hour 0 (analysis) is NOT available in NBM CONUS.
         """
-        # Hourly from 1-36
-        hourly = list(range(1, 37))
-        # Every 3 hours from 39-84 (not 38!)
-        three_hourly = list(range(39, 85, 3))
-        return hourly + three_hourly
+        return list(FORECAST_HOURS)
+
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def forecast_hours_up_to(max_forecast_hour: int) -> tuple[int, ...]:
+        """Return the available forecast hours no later than max_forecast_hour.
+
+        Only a handful of cutoffs are used in practice, so results are memoized.
+        """
+        return tuple(h for h in FORECAST_HOURS if h <= max_forecast_hour)
 
     @staticmethod
     def get_lead_time_hours() -> list[int]:
@@ -96,14 +125,17 @@ class NbmConusForecastRegionJob(RegionJob[NbmConusSourceFileCoord, DataVariableC
             - Hour 36 -> Index 35
             - Hour 39 -> Index 36
             - Hour 84 -> Index 51
+
+        Raises:
+            ValueError: If NBM doesn't produce the forecast hour
         """
-        if forecast_hour <= 36:
-            # Hourly: hours 1-36 map to indices 0-35
-            return forecast_hour - 1
-        else:
-            # 3-hourly: hours 39, 42, 45... map to indices 36, 37, 38...
-            # Hour 39 -> index 36, Hour 42 -> index 37, etc.
-            return 36 + (forecast_hour - 39) // 3
+        try:
+            return NbmConusForecastRegionJob._LEAD_TIME_INDEX[forecast_hour]
+        except KeyError:
+            raise ValueError(f"NBM CONUS has no forecast hour {forecast_hour}") from None
+
+    # Lead time index of each forecast hour, in FORECAST_HOURS order
+    _LEAD_TIME_INDEX = {forecast_hour: i for i, forecast_hour in enumerate(FORECAST_HOURS)}
 
     # Variable mapping from standard names to actual NBM GRIB2 element names
     # Based on inspection of NBM GRIB2 files
@@ -129,22 +161,160 @@ class NbmConusForecastRegionJob(RegionJob[NbmConusSourceFileCoord, DataVariableC
         "rh2m": {"grib_element": "RH", "short_name": "2-HTGL"},
     }
 
+    # wgrib2 variable names used in the `.idx` sidecar for each GRIB element above
+    IDX_VARIABLE_NAMES = {
+        "T": "TMP",
+        "Td": "DPT",
+        "WindSpd": "WIND",
+        "WindDir": "WDIR",
+        "WindGust": "GUST",
+        "QPF01": "APCP",
+        "SnowAmt01": "ASNOW",
+        "TCDC": "TCDC",
+        "CEIL": "CEIL",
+        "VIS": "VIS",
+        "DSWRF": "DSWRF",
+        "PRES": "PRES",
+        "RH": "RH",
+    }
+
+    # `.idx` level strings for each GRIB short name; short names not listed here
+    # match messages at any level
+    IDX_LEVELS = {
+        "2-HTGL": "2 m above ground",
+        "10-HTGL": "10 m above ground",
+        "80-HTGL": "80 m above ground",
+        "0-SFC": "surface",
+    }
+
+    # Number of GRIB files decoded concurrently; rasterio releases the GIL while
+    # decoding, so this scales with the available cores
+    MAX_READ_WORKERS = min(8, os.cpu_count() or 1)
+
+    # Codec for the on-disk cache of decoded arrays; Blosc decompresses far faster
+    # than GDAL can decode the GRIB packing
+    DECODED_CACHE_CODEC = Blosc(cname="zstd", clevel=3, shuffle=Blosc.SHUFFLE)
+
+    # GDAL options for opening downloaded GRIB files. By default every open looks
+    # for a PAM .aux.xml sidecar and lists the download directory for sibling
+    # files, which grows with the number of files in a cycle; neither is used here.
+    GDAL_GRIB_OPTIONS = MappingProxyType(
+        {"GDAL_PAM_ENABLED": "NO", "GDAL_DISABLE_READDIR_ON_OPEN": "EMPTY_DIR"}
+    )
+
+    @cached_property
+    def cache_decoded(self) -> bool:
+        """Return whether decoded arrays are cached on disk next to the downloads.
+
+        Off unless `NBM_CACHE_DECODED=1` is set: the cache only pays off when the
+        same files are processed again, and otherwise doubles scratch disk use.
+        """
+        return os.environ.get('NBM_CACHE_DECODED', '0') == '1'
+
+    @cached_property
+    def session(self) -> requests.Session:
+        """Return the HTTP session shared by all downloads in this job.
+
+        A single session keeps pooled keep-alive connections to NOMADS instead of
+        opening a new TCP+TLS connection for every file, and retries transient
+        server errors with backoff.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[500, 502, 503, 504],
+            ),
+        )
+        session.mount("https://", adapter)
+        return session
+
+    @cached_property
+    def wanted_idx_messages(self) -> frozenset[tuple[str, str | None]]:
+        """Return the (variable, level) pairs of `.idx` messages needed by this job.
+
+        A level of None matches the variable at any level. Wind components need
+        both the speed and direction messages at their level.
+        """
+        wanted: set[tuple[str, str | None]] = set()
+        for var_config in self.data_vars:
+            var_info = self.VARIABLE_MAPPING.get(var_config.name)
+            if var_info is None:
+                continue
+
+            elements = [var_info["grib_element"]]
+            if "wind_component" in var_info:
+                elements.append("WindDir")
+
+            level = self.IDX_LEVELS.get(var_info.get("short_name", ""))
+            for element in elements:
+                idx_name = self.IDX_VARIABLE_NAMES.get(element)
+                if idx_name is not None:
+                    wanted.add((idx_name, level))
+
+        return frozenset(wanted)
+
+    @staticmethod
+    def parse_idx(text: str) -> list[tuple[int, int, str, str]]:
+        """Parse a wgrib2 `.idx` file.
+
+        Each line looks like `1:0:d=2024010100:TMP:2 m above ground:1 hour fcst:`.
+
+        Returns:
+            List of (message number, byte offset, variable, level) tuples
+        """
+        messages = []
+        for line in text.splitlines():
+            fields = line.split(":")
+            if len(fields) < 5:
+                continue
+            messages.append((int(fields[0]), int(fields[1]), fields[3], fields[4]))
+        return messages
+
+    def get_byte_ranges(
+        self, source_coord: NbmConusSourceFileCoord
+    ) -> list[tuple[int, int | None]]:
+        """Return the byte ranges of the GRIB messages needed from a source file.
+
+        Adjacent messages are merged into a single range. An end of None means
+        the range runs to the end of the file. Returns an empty list if the index
+        can't be fetched or lists none of the wanted messages.
+        """
+        try:
+            response = self.session.get(source_coord.index_url(), timeout=30)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            print(f"  Warning: Could not fetch index {source_coord.index_url()}: {e}")
+            return []
+
+        messages = self.parse_idx(response.text)
+        wanted = self.wanted_idx_messages
+
+        ranges: list[tuple[int, int | None]] = []
+        for i, (_, offset, variable, level) in enumerate(messages):
+            if (variable, level) not in wanted and (variable, None) not in wanted:
+                continue
+
+            end = messages[i + 1][1] - 1 if i + 1 < len(messages) else None
+            if ranges and ranges[-1][1] == offset - 1:
+                ranges[-1] = (ranges[-1][0], end)
+            else:
+                ranges.append((offset, end))
+
+        return ranges
+
     def generate_source_file_coords(self) -> list[NbmConusSourceFileCoord]:
         """Generate source file coordinates for the processing region.
 
         NBM has hourly forecasts from 1-36h, then 3-hourly from 38-84h.
         Note: f000 (analysis) files often don't exist, so we start from f001.
         """
-        import os
-
-        coords = []
-
-        # Get the list of available forecast hours
-        forecast_hours = self.get_forecast_hours()
-
         # Allow limiting forecast hours via environment variable for testing
         max_forecast_hour = int(os.environ.get('NBM_MAX_FORECAST_HOUR', '84'))
-        forecast_hours = [h for h in forecast_hours if h <= max_forecast_hour]
+        forecast_hours = self.forecast_hours_up_to(max_forecast_hour)
 
         print(f"Generating source coords for {len(forecast_hours)} forecast hours:")
         print(f"  Hours 1-36: hourly")
@@ -152,59 +322,94 @@ class NbmConusForecastRegionJob(RegionJob[NbmConusSourceFileCoord, DataVariableC
             three_hourly_count = len([h for h in forecast_hours if h > 36])
             print(f"  Hours 38-{max_forecast_hour}: every 3 hours ({three_hourly_count} files)")
 
-        # Generate init times at hourly intervals
-        current_time = self.processing_region.init_time_start
-        while current_time <= self.processing_region.init_time_end:
-            # For each init time, generate coords for available forecast hours
-            for forecast_hour in forecast_hours:
-                coords.append(
-                    NbmConusSourceFileCoord(
-                        init_time=current_time,
-                        forecast_hour=forecast_hour,
-                        region="co",
-                    )
-                )
-
-            current_time += timedelta(hours=1)
+        # Generate init times at hourly intervals, each with all available forecast hours
+        init_times = pd.date_range(
+            self.processing_region.init_time_start,
+            self.processing_region.init_time_end,
+            freq="1h",
+        )
+        coords = [
+            NbmConusSourceFileCoord(init_time=init_time, forecast_hour=forecast_hour, region="co")
+            for init_time in init_times
+            for forecast_hour in forecast_hours
+        ]
 
         print(f"Generated {len(coords)} source file coordinates")
         return coords
 
     def download_file(self, source_coord: NbmConusSourceFileCoord) -> Path:
-        """Download a GRIB2 file from NOMADS."""
+        """Download a GRIB2 file from NOMADS.
+
+        Only the messages needed for this job's variables are fetched, using the
+        byte offsets in the `.idx` sidecar and HTTP Range requests. GRIB2 messages
+        are self-contained, so the fetched ranges concatenate into a valid file.
+        Falls back to downloading the whole file if the index is unavailable.
+        """
         url = source_coord.download_url()
 
-        # Create filename from source coordinate
-        date_str = source_coord.init_time.strftime("%Y%m%d")
-        cycle_str = source_coord.init_time.strftime("%H")
-        forecast_str = f"{source_coord.forecast_hour:03d}"
-        filename = f"blend.t{cycle_str}z.core.f{forecast_str}.{source_coord.region}.grib2"
+        filename = source_coord.filename
 
         # Create subdirectory for this date
-        download_path = self.download_dir / date_str / cycle_str
+        download_path = self.download_dir / source_coord.date_str / source_coord.cycle_str
         download_path.mkdir(parents=True, exist_ok=True)
 
-        file_path = download_path / filename
-
-        # Download if not already cached
-        if not file_path.exists():
-            print(f"  Downloading {filename} ({source_coord.forecast_hour}h forecast)...")
-
-            # Retry logic for network issues
-            max_retries = 3
+        # Subset files are named after the messages they contain, so a later job
+        # with different variables doesn't reuse a file missing some of them
+        wanted_key = ",".join(sorted(f"{var}:{level}" for var, level in self.wanted_idx_messages))
+        subset_tag = hashlib.sha1(wanted_key.encode()).hexdigest()[:8]
+        subset_path = download_path / filename.replace(".grib2", f".{subset_tag}.grib2")
+        full_path = download_path / filename
+
+        for cached_path in (subset_path, full_path):
+            if cached_path.exists():
+                logger.debug("Using cached %s", cached_path.name)
+                return cached_path
+
+        ranges = self.get_byte_ranges(source_coord)
+        if ranges:
+            file_path = subset_path
+            logger.debug(
+                "Downloading %d byte ranges of %s (%dh forecast)",
+                len(ranges), filename, source_coord.forecast_hour,
+            )
+        else:
+            file_path = full_path
+            ranges = [(0, None)]
+            logger.debug("Downloading %s (%dh forecast)", filename, source_coord.forecast_hour)
+
+        # Retry logic for network issues. Ranges are advanced as bytes arrive, so a
+        # retry resumes where the failed attempt stopped instead of starting over.
+        pending = list(ranges)
+        max_retries = 3
+        # Write to temporary file first
+        temp_path = file_path.with_suffix('.tmp')
+        with open(temp_path, "wb") as f:
             for attempt in range(max_retries):
                 try:
-                    response = requests.get(url, stream=True, timeout=60)
-                    response.raise_for_status()
-
-                    # Write to temporary file first
-                    temp_path = file_path.with_suffix('.tmp')
-                    with open(temp_path, "wb") as f:
-                        for chunk in response.iter_content(chunk_size=8192):
+                    while pending:
+                        start, end = pending[0]
+                        headers = {}
+                        if (start, end) != (0, None):
+                            headers["Range"] = f"bytes={start}-{'' if end is None else end}"
+                        response = self.session.get(url, headers=headers, stream=True, timeout=60)
+                        response.raise_for_status()
+
+                        # Server ignored the Range header and sent the whole file
+                        if headers and response.status_code != 206:
+                            f.seek(0)
+                            f.truncate()
+                            pending = [(0, None)]
+                            for chunk in response.iter_content(chunk_size=1 << 20):
+                                f.write(chunk)
+                                pending[0] = (pending[0][0] + len(chunk), None)
+                            pending.clear()
+                            break
+
+                        for chunk in response.iter_content(chunk_size=1 << 20):
                             f.write(chunk)
-
-                    # Move to final location
-                    temp_path.rename(file_path)
+                            start += len(chunk)
+                            pending[0] = (start, end)
+                        pending.pop(0)
                     break
 
                 except (requests.RequestException, IOError) as e:
@@ -213,62 +418,163 @@ class NbmConusForecastRegionJob(RegionJob[NbmConusSourceFileCoord, DataVariableC
                         continue
                     else:
                         raise
-        else:
-            print(f"  Using cached {filename}")
+
+        # Move to final location
+        temp_path.rename(file_path)
 
         return file_path
 
+    @staticmethod
+    def wind_components(speed: np.ndarray, direction: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Convert wind speed and direction to U (east-west) and V (north-south) components.
+
+        Direction is where the wind blows "from", so it's rotated by 180 degrees to
+        get the "to" direction. `direction` is overwritten with the angle in radians
+        to avoid allocating another grid-sized temporary. The math stays in the
+        inputs' dtype, float32 for bands from `read_data`.
+
+        The ufuncs release the GIL, so files decoded concurrently by the reader
+        threads of `process()` compute their wind components in parallel.
+        """
+        dir_rad = np.deg2rad(direction, out=direction)
+        dir_rad += np.pi
+
+        u = np.sin(dir_rad)
+        v = np.cos(dir_rad, out=dir_rad)
+        u *= speed
+        v *= speed
+        return u, v
+
+    def _decoded_cache_path(self, source_coord: NbmConusSourceFileCoord) -> Path:
+        """Return the decoded-array cache file for a source file and this job's variables.
+
+        It sits beside the file's download, so removing a cycle's downloads also
+        removes its cached arrays.
+        """
+        var_names = ",".join(sorted(var_config.name for var_config in self.data_vars))
+        var_tag = hashlib.sha1(var_names.encode()).hexdigest()[:8]
+        return (
+            self.download_dir / source_coord.date_str / source_coord.cycle_str
+            / source_coord.filename.replace(".grib2", f".{var_tag}.decoded.npz")
+        )
+
+    def _load_decoded(self, cache_path: Path) -> dict[str, np.ndarray]:
+        """Load decoded arrays written by `_save_decoded`."""
+        shape = (self._spatial_metadata['height'], self._spatial_metadata['width'])
+        data_dict: dict[str, np.ndarray] = {}
+        with np.load(cache_path) as cached:
+            for name in cached.files:
+                data = np.empty(shape, dtype=np.float32)
+                self.DECODED_CACHE_CODEC.decode(cached[name], out=data)
+                data_dict[name] = data
+        return data_dict
+
+    def _save_decoded(self, cache_path: Path, data_dict: dict[str, np.ndarray]) -> None:
+        """Write decoded arrays as Blosc-compressed buffers in an uncompressed .npz."""
+        encoded = {
+            name: np.frombuffer(
+                self.DECODED_CACHE_CODEC.encode(data.astype(np.float32, copy=False)), dtype=np.uint8
+            )
+            for name, data in data_dict.items()
+        }
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_suffix('.tmp')
+        with open(temp_path, "wb") as f:
+            np.savez(f, **encoded)
+        temp_path.rename(cache_path)
+
+    @cached_property
+    def wind_levels(self) -> frozenset[str]:
+        """Return the GRIB short names of levels with a requested wind component."""
+        return frozenset(
+            self.VARIABLE_MAPPING[var_config.name]["short_name"]
+            for var_config in self.data_vars
+            if "wind_component" in self.VARIABLE_MAPPING.get(var_config.name, {})
+        )
+
+    @contextmanager
+    def _open_grib(self, file_path: Path) -> Iterator[rasterio.DatasetReader]:
+        """Open a downloaded GRIB file with `GDAL_GRIB_OPTIONS`."""
+        with rasterio.Env(**self.GDAL_GRIB_OPTIONS), rasterio.open(file_path) as src:
+            yield src
+
+    def _store_spatial_metadata(self, src: rasterio.DatasetReader) -> None:
+        """Store the grid of an open GRIB file for coordinate extraction."""
+        self._spatial_metadata = {
+            'transform': src.transform,
+            'bounds': src.bounds,
+            'crs': src.crs,
+            'width': src.width,
+            'height': src.height,
+        }
+
     def read_data(
         self, file_path: Path, source_coord: NbmConusSourceFileCoord
     ) -> dict[str, np.ndarray]:
         """Read data from GRIB2 file using rasterio.
 
+        With `cache_decoded`, decoded arrays are cached next to the downloads, so
+        re-processing a file skips GRIB decoding. The cache is only used once
+        spatial metadata has been taken from a real GRIB file.
+
         Returns a dictionary mapping variable names to numpy arrays.
         """
+        cache_path = self._decoded_cache_path(source_coord) if self.cache_decoded else None
+        if cache_path is not None and hasattr(self, '_spatial_metadata') and cache_path.exists():
+            return self._load_decoded(cache_path)
+
         data_dict: dict[str, np.ndarray] = {}
 
         # Storage for wind data (need both speed and direction for U/V calculation)
         wind_data: dict[str, tuple[np.ndarray, np.ndarray]] = {}  # level -> (speed, direction)
 
         try:
-            with rasterio.open(file_path) as src:
+            with self._open_grib(file_path) as src:
                 # Store spatial metadata for coordinate extraction (if not already stored)
                 if not hasattr(self, '_spatial_metadata'):
-                    self._spatial_metadata = {
-                        'transform': src.transform,
-                        'bounds': src.bounds,
-                        'crs': src.crs,
-                        'width': src.width,
-                        'height': src.height,
-                    }
+                    self._store_spatial_metadata(src)
+
+                # Index band numbers by GRIB element in a single pass over the band
+                # metadata, so each variable below is a dict lookup
+                band_index: dict[str, list[tuple[int, str]]] = {}
+                for band_idx in range(1, src.count + 1):
+                    tags = src.tags(band_idx)
+                    band_index.setdefault(tags.get("GRIB_ELEMENT", ""), []).append(
+                        (band_idx, tags.get("GRIB_SHORT_NAME", ""))
+                    )
 
-                # Read metadata for all bands
-                tags_list = [src.tags(i) for i in range(1, src.count + 1)]
+                # Scratch mask reused for every band read from this file. The sentinel
+                # is compared as float32, the same rounding GDAL applies to the band.
+                nodata = None if src.nodata is None else np.float32(src.nodata)
+                nodata_mask = np.empty((src.height, src.width), dtype=bool)
+
+                def read_band(band_idx: int) -> np.ndarray:
+                    """Read a band, replacing missing values with NaN in place."""
+                    # Decode straight into the dataset's float32 dtype rather than
+                    # letting rasterio allocate a float64 array that gets cast later
+                    data = np.empty((src.height, src.width), dtype=np.float32)
+                    src.read(band_idx, out=data)
+                    if nodata is not None:
+                        np.equal(data, nodata, out=nodata_mask)
+                        np.copyto(data, np.nan, where=nodata_mask)
+                    return data
 
                 # First pass: collect wind speed and direction data
-                for band_idx, tags in enumerate(tags_list, start=1):
-                    grib_element = tags.get("GRIB_ELEMENT", "")
-                    short_name = tags.get("GRIB_SHORT_NAME", "")
-
-                    if grib_element == "WindSpd":
-                        data = src.read(band_idx)
-                        nodata = src.nodata
-                        if nodata is not None:
-                            data = np.where(data == nodata, np.nan, data)
-
+                for component, grib_element in enumerate(("WindSpd", "WindDir")):
+                    for band_idx, short_name in band_index.get(grib_element, ()):
+                        # Only decode levels a requested wind component needs
+                        if short_name not in self.wind_levels:
+                            continue
                         if short_name not in wind_data:
                             wind_data[short_name] = [None, None]
-                        wind_data[short_name][0] = data  # speed
+                        # 0 = speed, 1 = direction
+                        wind_data[short_name][component] = read_band(band_idx)
 
-                    elif grib_element == "WindDir":
-                        data = src.read(band_idx)
-                        nodata = src.nodata
-                        if nodata is not None:
-                            data = np.where(data == nodata, np.nan, data)
-
-                        if short_name not in wind_data:
-                            wind_data[short_name] = [None, None]
-                        wind_data[short_name][1] = data  # direction
+                # Decompose wind into U/V once per level, shared by both components
+                wind_uv: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+                for short_name, (speed, direction) in wind_data.items():
+                    if speed is not None and direction is not None:
+                        wind_uv[short_name] = self.wind_components(speed, direction)
 
                 # Process each requested variable
                 for var_config in self.data_vars:
@@ -282,18 +588,10 @@ class NbmConusForecastRegionJob(RegionJob[NbmConusSourceFileCoord, DataVariableC
                     # Handle wind components specially
                     if "wind_component" in var_info:
                         if short_name in wind_data:
-                            speed, direction = wind_data[short_name]
-                            if speed is not None and direction is not None:
-                                # Convert wind direction (from) to radians
-                                # Direction is "from", so add 180 to get "to" direction
-                                dir_rad = np.deg2rad(direction + 180)
-
-                                if var_info["wind_component"] == "u":
-                                    # U component (east-west)
-                                    data_dict[var_config.name] = speed * np.sin(dir_rad)
-                                else:
-                                    # V component (north-south)
-                                    data_dict[var_config.name] = speed * np.cos(dir_rad)
+                            if short_name in wind_uv:
+                                u, v = wind_uv[short_name]
+                                is_u = var_info["wind_component"] == "u"
+                                data_dict[var_config.name] = u if is_u else v
                             else:
                                 print(f"  Warning: Missing wind speed or direction for {var_config.name}")
                         else:
@@ -302,24 +600,12 @@ class NbmConusForecastRegionJob(RegionJob[NbmConusSourceFileCoord, DataVariableC
 
                     # For non-wind variables, find matching band
                     found = False
-                    for band_idx, tags in enumerate(tags_list, start=1):
-                        elem = tags.get("GRIB_ELEMENT", "")
-                        sname = tags.get("GRIB_SHORT_NAME", "")
-
-                        # Match both element and short_name if specified
-                        if elem == grib_element:
-                            if not short_name or short_name in sname:
-                                # Read the band data
-                                data = src.read(band_idx)
-
-                                # Handle missing values
-                                nodata = src.nodata
-                                if nodata is not None:
-                                    data = np.where(data == nodata, np.nan, data)
-
-                                data_dict[var_config.name] = data
-                                found = True
-                                break
+                    for band_idx, sname in band_index.get(grib_element, ()):
+                        # Match short_name too if specified
+                        if not short_name or short_name in sname:
+                            data_dict[var_config.name] = read_band(band_idx)
+                            found = True
+                            break
 
                     if not found:
                         print(f"  Warning: Variable {var_config.name} ({grib_element}) not found in GRIB file")
@@ -328,6 +614,8 @@ class NbmConusForecastRegionJob(RegionJob[NbmConusSourceFileCoord, DataVariableC
             print(f"  Error reading GRIB file {file_path}: {e}")
             raise
 
+        if cache_path is not None:
+            self._save_decoded(cache_path, data_dict)
         return data_dict
 
     def _get_projection_coordinates(self) -> tuple[np.ndarray, np.ndarray]:
@@ -336,6 +624,9 @@ class NbmConusForecastRegionJob(RegionJob[NbmConusSourceFileCoord, DataVariableC
         Returns:
             Tuple of (x_coords, y_coords) in projection meters
         """
+        if hasattr(self, '_projection_coordinates'):
+            return self._projection_coordinates
+
         if not hasattr(self, '_spatial_metadata'):
             raise RuntimeError("Spatial metadata not available. Must read at least one GRIB file first.")
 
@@ -343,149 +634,47 @@ class NbmConusForecastRegionJob(RegionJob[NbmConusSourceFileCoord, DataVariableC
         width = self._spatial_metadata['width']
         height = self._spatial_metadata['height']
 
-        # Generate x coordinates (columns) - center of each pixel
-        x_coords = np.array([
-            transform * (col + 0.5, 0.5)
-            for col in range(width)
-        ])[:, 0]  # Extract x values
-
-        # Generate y coordinates (rows) - center of each pixel
-        y_coords = np.array([
-            transform * (0.5, row + 0.5)
-            for row in range(height)
-        ])[:, 1]  # Extract y values
+        # Pixel centers along the first row (x) and first column (y), applying the
+        # affine transform to whole index vectors at once
+        cols = np.arange(width, dtype=np.float64) + 0.5
+        rows = np.arange(height, dtype=np.float64) + 0.5
+        x_coords = transform.a * cols + transform.b * 0.5 + transform.c
+        y_coords = transform.d * 0.5 + transform.e * rows + transform.f
 
         print(f"Generated projection coordinates:")
         print(f"  x range: {x_coords[0]:.0f} to {x_coords[-1]:.0f} meters ({len(x_coords)} points)")
         print(f"  y range: {y_coords[0]:.0f} to {y_coords[-1]:.0f} meters ({len(y_coords)} points)")
 
-        return x_coords.astype(np.int32), y_coords.astype(np.int32)
+        # The grid is the same for every file, so compute this once per job
+        self._projection_coordinates = (x_coords.astype(np.int32), y_coords.astype(np.int32))
+        return self._projection_coordinates
 
-    def process(self) -> xr.Dataset:
-        """Process the region and return the populated dataset.
+    def prepare_template(self, ds: xr.Dataset) -> xr.Dataset:
+        """Set the template's x/y coordinates from the grid of the first source file.
 
-        Overrides base class to set up irregular lead_time coordinate and
-        extract projection coordinates from GRIB files.
+        The template already carries NBM's irregular lead_time coordinate
+        [1, 2, ..., 36, 39, 42, 45, 48, 51, 54, 57, 60, 63, 66, 69, 72, 75, 78, 81, 84].
         """
-        # Generate source file coordinates
-        source_coords = self.generate_source_file_coords()
-
-        # Download first file to extract spatial metadata
+        # Download first file to extract spatial metadata. This also creates the
+        # shared HTTP session before the download threads use it.
         print("Downloading first file to extract spatial coordinates...")
-        first_file = self.download_file(source_coords[0])
-        _ = self.read_data(first_file, source_coords[0])  # This stores spatial metadata
-
-        # Create dimension coordinates
-        init_times = pd.date_range(
-            start=self.processing_region.init_time_start,
-            end=self.processing_region.init_time_end,
-            freq="1h",
-            tz="UTC",
-        )
-
-        print(f"DEBUG process(): init_times={init_times}")
-        print(f"DEBUG process(): init_times[0]={init_times[0]}, type={type(init_times[0])}")
-
-        # Build empty dataset
-        ds = self.template_config.get_template(
-            append_dim_start=init_times[0],
-            append_dim_periods=len(init_times),
-            append_dim_freq="1h",
-        )
-
-        print(f"DEBUG process(): ds.init_time.values={ds.init_time.values}")
-        print(f"DEBUG process(): ds.init_time.values[0]={ds.init_time.values[0]}, dtype={ds.init_time.values.dtype}")
+        first_file = self.download_file(self.source_file_coords[0])
+        with self._open_grib(first_file) as src:
+            # Only the grid is needed here, so no bands are decoded
+            self._store_spatial_metadata(src)
 
         # Replace x/y coordinates with actual projection coordinates from GRIB
         x_coords, y_coords = self._get_projection_coordinates()
         ds = ds.assign_coords(x=x_coords, y=y_coords)
 
-        # Create irregular lead_time coordinate values for NBM
-        # [1, 2, ..., 36, 39, 42, 45, 48, 51, 54, 57, 60, 63, 66, 69, 72, 75, 78, 81, 84]
-        lead_time_hours = self.get_lead_time_hours()
-        lead_times = pd.to_timedelta(lead_time_hours, unit='h')
-        ds = ds.assign_coords(lead_time=lead_times)
-
-        print(f"Lead time values: {lead_time_hours}")
-        print(f"Processing {len(source_coords)} source files...")
-        print(f"Total data to download: ~{len(source_coords) * 150 / 1024:.1f} GB")
-
-        # CRITICAL: Convert dask arrays to numpy arrays to enable in-place assignment
-        # If we don't do this, assignments to .values won't persist because dask arrays are lazy/immutable
-        print("Converting dask arrays to numpy for data population...")
-        for var_name in ds.data_vars:
-            if hasattr(ds[var_name].data, 'compute'):  # Check if it's a dask array
-                ds[var_name].data = ds[var_name].data.compute()
-        print("✅ Arrays converted to numpy")
-
-        # Process each source file
-        processed_count = 0
-        for idx, source_coord in enumerate(source_coords, 1):
-            try:
-                # Download file
-                print(f"[{idx}/{len(source_coords)}] Downloading: {source_coord.download_url()}")
-                file_path = self.download_file(source_coord)
-
-                # Read data
-                result = self.read_data(file_path, source_coord)
-
-                # Handle backward compatibility
-                if isinstance(result, tuple):
-                    data_dict, metadata = result
-                else:
-                    data_dict = result
-                    metadata = {}
-
-                # Get indices for this source coordinate
-                indices = self.get_indices(source_coord)
-                init_time = indices['init_time']
-                forecast_hour = indices['forecast_hour']
-
-                # Normalize init_time to timezone-naive for comparison
-                # (dataset coords are timezone-naive after Zarr conversion)
-                if isinstance(init_time, pd.Timestamp) and init_time.tz is not None:
-                    init_time_naive = init_time.tz_localize(None).to_datetime64()
-                elif hasattr(init_time, 'tz') and init_time.tz is not None:
-                    init_time_naive = pd.Timestamp(init_time).tz_localize(None).to_datetime64()
-                else:
-                    init_time_naive = np.datetime64(init_time, 'ns')
-
-                # Find the init_time index
-                init_idx = np.where(ds.init_time.values == init_time_naive)[0]
-                if len(init_idx) == 0:
-                    print(f"Warning: init_time {init_time} not found in dataset")
-                    print(f"  Tried to match: {init_time_naive}")
-                    print(f"  Available times: {ds.init_time.values}")
-                    continue
-                init_idx = init_idx[0]
-
-                # Apply transformations and populate dataset
-                for var_config in self.data_vars:
-                    if var_config.name in data_dict:
-                        transformed_data = self.apply_transformations(
-                            {var_config.name: data_dict[var_config.name]}, var_config
-                        )
-
-                        # Populate the dataset with the data at the correct indices
-                        # forecast_hour is the lead_time index (already mapped by get_indices)
-                        data_array = transformed_data[var_config.name]
-                        ds[var_config.name].values[init_idx, forecast_hour, :, :] = data_array
-
-                processed_count += 1
-                # Report progress more frequently for long downloads
-                if processed_count % 5 == 0 or processed_count == len(source_coords):
-                    pct = (processed_count / len(source_coords)) * 100
-                    print(f"✅ Progress: {processed_count}/{len(source_coords)} files ({pct:.1f}%)")
-
-            except Exception as e:
-                print(f"Error processing {source_coord}: {e}")
-                import traceback
-                traceback.print_exc()
-                continue
-
-        print(f"Successfully processed {processed_count}/{len(source_coords)} files")
+        print(f"Lead time values: {self.get_lead_time_hours()}")
         return ds
 
+    def close(self) -> None:
+        """Close the HTTP session shared by this job's downloads."""
+        if "session" in self.__dict__:
+            self.session.close()
+
     def get_indices(self, source_coord: NbmConusSourceFileCoord) -> dict[str, int]:
         """Get dataset indices for a source coordinate.
 
@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+import logging
+from collections.abc import Mapping
 from functools import cached_property
+from types import MappingProxyType
+from typing import Any
 
 import numpy as np
 import pandas as pd
@@ -15,6 +19,332 @@ from nbm_to_zarr.base.template_config import (
     TemplateConfig,
 )
 
+logger = logging.getLogger(__name__)
+
+# Hourly from 1-36, then every 3 hours from 39-84 (not 38!). No hour 0 (analysis).
+FORECAST_HOURS: tuple[int, ...] = (*range(1, 37), *range(39, 85, 3))
+
+# The lead_time coordinate, built once at import
+LEAD_TIMES_NS = np.array(FORECAST_HOURS, dtype="timedelta64[h]").astype("timedelta64[ns]")
+LEAD_TIMES_NS.flags.writeable = False
+
+# Common chunking strategy, shared (read-only) by every data variable. Sized for CONUS-wide
+# reads from object storage: ~39 MB uncompressed, ~8-16 MB compressed per chunk.
+_NBM_CHUNKS: Mapping[str, int] = MappingProxyType({
+    "init_time": 1,
+    "lead_time": 52,  # All lead times in one chunk
+    "y": 400,  # ~1597/4
+    "x": 469,  # 2345/5
+})
+
+# One Zarr v3 shard per init time per variable, so a forecast cycle is a single
+# object per variable while reads can still fetch individual chunks
+_NBM_SHARDS: Mapping[str, int] = MappingProxyType({
+    "init_time": 1,
+    "lead_time": 52,
+    "y": 1600,  # 4 chunks, covering all 1597 rows
+    "x": 2345,
+})
+
+# Built once at import; every template instance hands out the same (frozen) configs.
+# Bit-rounded variables use compression level 1: rounding already leaves long runs
+# of zero bits, so higher levels cost several times the CPU for a few percent.
+# Cloud cover is packed as whole percent in a uint8, which still reads back as
+# float32, and is bit shuffled; packing with a fractional scale_factor would read
+# back as float64, so other variables stay bit-rounded float32.
+_NBM_DATA_VARS: tuple[DataVariableConfig, ...] = (
+    # Temperature variables
+    DataVariableConfig(
+        name="t2m",
+        dtype="float32",
+        chunks=_NBM_CHUNKS,
+        shards=_NBM_SHARDS,
+        keepbits=12,
+        compressor_level=1,
+        attrs={
+            "long_name": "2-meter temperature",
+            "units": "K",
+            "grid_mapping": "spatial_ref",
+        },
+    ),
+    DataVariableConfig(
+        name="dpt2m",
+        dtype="float32",
+        chunks=_NBM_CHUNKS,
+        shards=_NBM_SHARDS,
+        keepbits=12,
+        compressor_level=1,
+        attrs={
+            "long_name": "2-meter dewpoint temperature",
+            "units": "K",
+            "grid_mapping": "spatial_ref",
+        },
+    ),
+    DataVariableConfig(
+        name="tmax",
+        dtype="float32",
+        chunks=_NBM_CHUNKS,
+        shards=_NBM_SHARDS,
+        keepbits=12,
+        compressor_level=1,
+        attrs={
+            "long_name": "Maximum temperature",
+            "units": "K",
+            "grid_mapping": "spatial_ref",
+        },
+    ),
+    DataVariableConfig(
+        name="tmin",
+        dtype="float32",
+        chunks=_NBM_CHUNKS,
+        shards=_NBM_SHARDS,
+        keepbits=12,
+        compressor_level=1,
+        attrs={
+            "long_name": "Minimum temperature",
+            "units": "K",
+            "grid_mapping": "spatial_ref",
+        },
+    ),
+    # Wind variables
+    DataVariableConfig(
+        name="u10m",
+        dtype="float32",
+        chunks=_NBM_CHUNKS,
+        shards=_NBM_SHARDS,
+        keepbits=10,
+        compressor_level=1,
+        attrs={
+            "long_name": "10-meter u-component of wind",
+            "units": "m s-1",
+            "grid_mapping": "spatial_ref",
+        },
+    ),
+    DataVariableConfig(
+        name="v10m",
+        dtype="float32",
+        chunks=_NBM_CHUNKS,
+        shards=_NBM_SHARDS,
+        keepbits=10,
+        compressor_level=1,
+        attrs={
+            "long_name": "10-meter v-component of wind",
+            "units": "m s-1",
+            "grid_mapping": "spatial_ref",
+        },
+    ),
+    DataVariableConfig(
+        name="u80m",
+        dtype="float32",
+        chunks=_NBM_CHUNKS,
+        shards=_NBM_SHARDS,
+        keepbits=10,
+        compressor_level=1,
+        attrs={
+            "long_name": "80-meter u-component of wind",
+            "units": "m s-1",
+            "grid_mapping": "spatial_ref",
+        },
+    ),
+    DataVariableConfig(
+        name="v80m",
+        dtype="float32",
+        chunks=_NBM_CHUNKS,
+        shards=_NBM_SHARDS,
+        keepbits=10,
+        compressor_level=1,
+        attrs={
+            "long_name": "80-meter v-component of wind",
+            "units": "m s-1",
+            "grid_mapping": "spatial_ref",
+        },
+    ),
+    DataVariableConfig(
+        name="gust",
+        dtype="float32",
+        chunks=_NBM_CHUNKS,
+        shards=_NBM_SHARDS,
+        keepbits=10,
+        compressor_level=1,
+        attrs={
+            "long_name": "Wind gust",
+            "units": "m s-1",
+            "grid_mapping": "spatial_ref",
+        },
+    ),
+    # Precipitation variables
+    DataVariableConfig(
+        name="tp",
+        dtype="float32",
+        chunks=_NBM_CHUNKS,
+        shards=_NBM_SHARDS,
+        keepbits=14,
+        compressor_level=1,
+        attrs={
+            "long_name": "Total precipitation",
+            "units": "kg m-2",
+            "grid_mapping": "spatial_ref",
+        },
+    ),
+    DataVariableConfig(
+        name="prate",
+        dtype="float32",
+        chunks=_NBM_CHUNKS,
+        shards=_NBM_SHARDS,
+        keepbits=12,
+        compressor_level=1,
+        attrs={
+            "long_name": "Precipitation rate",
+            "units": "kg m-2 s-1",
+            "grid_mapping": "spatial_ref",
+        },
+    ),
+    DataVariableConfig(
+        name="snow",
+        dtype="float32",
+        chunks=_NBM_CHUNKS,
+        shards=_NBM_SHARDS,
+        keepbits=14,
+        compressor_level=1,
+        attrs={
+            "long_name": "Snow accumulation",
+            "units": "kg m-2",
+            "grid_mapping": "spatial_ref",
+        },
+    ),
+    # Cloud and visibility
+    DataVariableConfig(
+        name="tcc",
+        dtype="float32",
+        chunks=_NBM_CHUNKS,
+        shards=_NBM_SHARDS,
+        packed_dtype="uint8",  # Whole percent
+        bitshuffle=True,
+        attrs={
+            "long_name": "Total cloud cover",
+            "units": "%",
+            "grid_mapping": "spatial_ref",
+        },
+    ),
+    DataVariableConfig(
+        name="ceil",
+        dtype="float32",
+        chunks=_NBM_CHUNKS,
+        shards=_NBM_SHARDS,
+        keepbits=10,
+        compressor_level=1,
+        attrs={
+            "long_name": "Ceiling height",
+            "units": "m",
+            "grid_mapping": "spatial_ref",
+        },
+    ),
+    DataVariableConfig(
+        name="vis",
+        dtype="float32",
+        chunks=_NBM_CHUNKS,
+        shards=_NBM_SHARDS,
+        keepbits=10,
+        compressor_level=1,
+        attrs={
+            "long_name": "Visibility",
+            "units": "m",
+            "grid_mapping": "spatial_ref",
+        },
+    ),
+    # Radiation
+    DataVariableConfig(
+        name="dswrf",
+        dtype="float32",
+        chunks=_NBM_CHUNKS,
+        shards=_NBM_SHARDS,
+        keepbits=12,
+        compressor_level=1,
+        attrs={
+            "long_name": "Downward shortwave radiation flux",
+            "units": "W m-2",
+            "grid_mapping": "spatial_ref",
+        },
+    ),
+    DataVariableConfig(
+        name="dlwrf",
+        dtype="float32",
+        chunks=_NBM_CHUNKS,
+        shards=_NBM_SHARDS,
+        keepbits=12,
+        compressor_level=1,
+        attrs={
+            "long_name": "Downward longwave radiation flux",
+            "units": "W m-2",
+            "grid_mapping": "spatial_ref",
+        },
+    ),
+    # Pressure and humidity
+    DataVariableConfig(
+        name="sp",
+        dtype="float32",
+        chunks=_NBM_CHUNKS,
+        shards=_NBM_SHARDS,
+        keepbits=12,
+        compressor_level=1,
+        attrs={
+            "long_name": "Surface pressure",
+            "units": "Pa",
+            "grid_mapping": "spatial_ref",
+        },
+    ),
+    DataVariableConfig(
+        name="rh2m",
+        dtype="float32",
+        chunks=_NBM_CHUNKS,
+        shards=_NBM_SHARDS,
+        keepbits=10,
+        compressor_level=1,
+        attrs={
+            "long_name": "2-meter relative humidity",
+            "units": "%",
+            "grid_mapping": "spatial_ref",
+        },
+    ),
+)
+
+
+# Dimension coordinates, built once at import like the data variable configs
+_NBM_DIMENSION_COORDINATES: tuple[CoordinateConfig, ...] = (
+    CoordinateConfig(
+        name="init_time",
+        dtype="datetime64[ns]",
+        attrs={
+            "long_name": "Forecast initialization time",
+            "standard_name": "forecast_reference_time",
+        },
+    ),
+    CoordinateConfig(
+        name="lead_time",
+        dtype="timedelta64[ns]",
+        attrs={
+            "long_name": "Forecast lead time",
+            "standard_name": "forecast_period",
+        },
+    ),
+    CoordinateConfig(
+        name="y",
+        dtype="int32",
+        attrs={
+            "long_name": "y-coordinate in projection",
+            "units": "meters",
+        },
+    ),
+    CoordinateConfig(
+        name="x",
+        dtype="int32",
+        attrs={
+            "long_name": "x-coordinate in projection",
+            "units": "meters",
+        },
+    ),
+)
+
 
 class NbmConusTemplateConfig(TemplateConfig[DataVariableConfig]):
     """Template configuration for NBM CONUS forecast dataset.
@@ -32,7 +362,7 @@ class NbmConusTemplateConfig(TemplateConfig[DataVariableConfig]):
     - Note: Hour 0 (analysis) is NOT available in NBM
     """
 
-    dimensions: dict[str, int] = {
+    dimensions: Mapping[str, int] = {
         "init_time": 1,  # Will be extended dynamically
         "lead_time": 52,  # 1-36h hourly + 39-84h every 3h (NO hour 0)
         "y": 1597,
@@ -58,103 +388,82 @@ class NbmConusTemplateConfig(TemplateConfig[DataVariableConfig]):
 
     def dimension_coordinates(self) -> list[CoordinateConfig]:
         """Return dimension coordinate configurations."""
-        return [
-            CoordinateConfig(
-                name="init_time",
-                dtype="datetime64[ns]",
-                attrs={
-                    "long_name": "Forecast initialization time",
-                    "standard_name": "forecast_reference_time",
-                },
-            ),
-            CoordinateConfig(
-                name="lead_time",
-                dtype="timedelta64[ns]",
-                attrs={
-                    "long_name": "Forecast lead time",
-                    "standard_name": "forecast_period",
-                },
-            ),
-            CoordinateConfig(
-                name="y",
-                dtype="int32",
-                attrs={
-                    "long_name": "y-coordinate in projection",
-                    "units": "meters",
-                },
-            ),
-            CoordinateConfig(
-                name="x",
-                dtype="int32",
-                attrs={
-                    "long_name": "x-coordinate in projection",
-                    "units": "meters",
-                },
-            ),
-        ]
+        return list(_NBM_DIMENSION_COORDINATES)
 
     def derive_coordinates(self, ds: xr.Dataset) -> xr.Dataset:
         """Derive additional coordinates from dimension coordinates."""
+        # New and replaced coordinates are collected and assigned in one call, since
+        # each assign_coords re-aligns and copies the whole dataset
+        coords: dict[str, Any] = {}
+
         # Add valid_time coordinate
         if "init_time" in ds.coords and "lead_time" in ds.coords:
-            # Convert init_time to datetime64[ns] without timezone for numpy operations
-            # Use pandas to handle timezone-aware datetimes properly
-            init_time_values = pd.DatetimeIndex(ds.coords["init_time"].values)
-            print(f"DEBUG derive_coordinates: original init_time_values={init_time_values}, tz={init_time_values.tz}")
+            # Convert init_time to datetime64[ns] without timezone for numpy operations.
+            # Coordinates are usually already naive datetime64, so only go through
+            # pandas for anything else (timezone-aware or object values).
+            init_time_values = ds.coords["init_time"].values
 
-            # Remove timezone if present
-            if init_time_values.tz is not None:
-                init_time_values = init_time_values.tz_localize(None)
-                print(f"DEBUG derive_coordinates: after tz_localize(None)={init_time_values}")
-
-            # Convert to numpy array
-            init_time_values = init_time_values.to_numpy(dtype='datetime64[ns]')
-            print(f"DEBUG derive_coordinates: final init_time_values={init_time_values}")
+            if init_time_values.dtype.kind == "M":
+                init_time_values = init_time_values.astype("datetime64[ns]", copy=False)
+            else:
+                init_time_index = pd.DatetimeIndex(init_time_values)
+                if init_time_index.tz is not None:
+                    init_time_index = init_time_index.tz_convert("UTC").tz_localize(None)
+                init_time_values = init_time_index.as_unit("ns").asi8.view("datetime64[ns]")
+            logger.debug(
+                "derive_coordinates: init_time dtype=%s len=%d",
+                init_time_values.dtype, init_time_values.size,
+            )
 
             # CRITICAL: Update the init_time coordinate to be timezone-naive datetime64[ns]
             # This ensures it can be properly compared later
-            ds = ds.assign_coords(init_time=init_time_values)
-            print(f"DEBUG derive_coordinates: ds.init_time after assign={ds.init_time.values}, dtype={ds.init_time.dtype}")
+            coords["init_time"] = init_time_values
 
-            # Now we can safely add datetime64 + timedelta64
-            valid_time_values = (
-                init_time_values[:, np.newaxis]
-                + ds.coords["lead_time"].values[np.newaxis, :]
-            )
+            # NBM lead times are fixed, so the template's placeholder lead_time values are
+            # replaced with them before valid_time is derived
+            lead_time_values = ds.coords["lead_time"].values
+            if ds.sizes["lead_time"] == LEAD_TIMES_NS.size:
+                lead_time_values = LEAD_TIMES_NS
+                coords["lead_time"] = ds["lead_time"].variable.copy(data=lead_time_values)
 
-            ds = ds.assign_coords(
-                valid_time=(
-                    ["init_time", "lead_time"],
-                    valid_time_values,
-                    {
-                        "long_name": "Forecast valid time",
-                        "standard_name": "time",
-                    },
-                )
+            # Now we can safely add datetime64 + timedelta64. Built lazily, so the
+            # (init_time, lead_time) grid is only computed when it's read or written.
+            import dask.array as da
+
+            valid_time_values = (
+                da.from_array(init_time_values, chunks=-1)[:, np.newaxis]
+                + da.from_array(lead_time_values, chunks=-1)[np.newaxis, :]
             )
 
-        # Add spatial_ref coordinate for projection information
-        ds = ds.assign_coords(
-            spatial_ref=(
-                [],
-                0,
+            coords["valid_time"] = (
+                ["init_time", "lead_time"],
+                valid_time_values,
                 {
-                    "grid_mapping_name": "lambert_conformal_conic",
-                    "standard_parallel": [25.0, 25.0],
-                    "longitude_of_central_meridian": -95.0,
-                    "latitude_of_projection_origin": 25.0,
-                    "false_easting": 0.0,
-                    "false_northing": 0.0,
-                    "earth_radius": 6371200.0,
-                    "proj4": (
-                        "+proj=lcc +lat_1=25 +lat_2=25 +lat_0=25 +lon_0=-95 "
-                        "+x_0=0 +y_0=0 +R=6371200 +units=m +no_defs"
-                    ),
+                    "long_name": "Forecast valid time",
+                    "standard_name": "time",
                 },
             )
+
+        # Add spatial_ref coordinate for projection information
+        coords["spatial_ref"] = (
+            [],
+            0,
+            {
+                "grid_mapping_name": "lambert_conformal_conic",
+                "standard_parallel": [25.0, 25.0],
+                "longitude_of_central_meridian": -95.0,
+                "latitude_of_projection_origin": 25.0,
+                "false_easting": 0.0,
+                "false_northing": 0.0,
+                "earth_radius": 6371200.0,
+                "proj4": (
+                    "+proj=lcc +lat_1=25 +lat_2=25 +lat_0=25 +lon_0=-95 "
+                    "+x_0=0 +y_0=0 +R=6371200 +units=m +no_defs"
+                ),
+            },
         )
 
-        return ds
+        return ds.assign_coords(coords)
 
     @cached_property
     def coords(self) -> list[CoordinateConfig]:
@@ -166,230 +475,6 @@ class NbmConusTemplateConfig(TemplateConfig[DataVariableConfig]):
         """Return data variable configurations.
 
         Variables are selected based on common use cases and data availability.
-        Each variable includes chunking optimized for ~3-5MB compressed chunks.
+        Each variable includes chunking optimized for ~8-16MB compressed chunks.
         """
-        # Common chunking strategy
-        chunks = {
-            "init_time": 1,
-            "lead_time": 53,  # All lead times in one chunk
-            "y": 266,  # ~1597/6
-            "x": 391,  # ~2345/6
-        }
-
-        return [
-            # Temperature variables
-            DataVariableConfig(
-                name="t2m",
-                dtype="float32",
-                chunks=chunks,
-                keepbits=12,
-                attrs={
-                    "long_name": "2-meter temperature",
-                    "units": "K",
-                    "grid_mapping": "spatial_ref",
-                },
-            ),
-            DataVariableConfig(
-                name="dpt2m",
-                dtype="float32",
-                chunks=chunks,
-                keepbits=12,
-                attrs={
-                    "long_name": "2-meter dewpoint temperature",
-                    "units": "K",
-                    "grid_mapping": "spatial_ref",
-                },
-            ),
-            DataVariableConfig(
-                name="tmax",
-                dtype="float32",
-                chunks=chunks,
-                keepbits=12,
-                attrs={
-                    "long_name": "Maximum temperature",
-                    "units": "K",
-                    "grid_mapping": "spatial_ref",
-                },
-            ),
-            DataVariableConfig(
-                name="tmin",
-                dtype="float32",
-                chunks=chunks,
-                keepbits=12,
-                attrs={
-                    "long_name": "Minimum temperature",
-                    "units": "K",
-                    "grid_mapping": "spatial_ref",
-                },
-            ),
-            # Wind variables
-            DataVariableConfig(
-                name="u10m",
-                dtype="float32",
-                chunks=chunks,
-                keepbits=10,
-                attrs={
-                    "long_name": "10-meter u-component of wind",
-                    "units": "m s-1",
-                    "grid_mapping": "spatial_ref",
-                },
-            ),
-            DataVariableConfig(
-                name="v10m",
-                dtype="float32",
-                chunks=chunks,
-                keepbits=10,
-                attrs={
-                    "long_name": "10-meter v-component of wind",
-                    "units": "m s-1",
-                    "grid_mapping": "spatial_ref",
-                },
-            ),
-            DataVariableConfig(
-                name="u80m",
-                dtype="float32",
-                chunks=chunks,
-                keepbits=10,
-                attrs={
-                    "long_name": "80-meter u-component of wind",
-                    "units": "m s-1",
-                    "grid_mapping": "spatial_ref",
-                },
-            ),
-            DataVariableConfig(
-                name="v80m",
-                dtype="float32",
-                chunks=chunks,
-                keepbits=10,
-                attrs={
-                    "long_name": "80-meter v-component of wind",
-                    "units": "m s-1",
-                    "grid_mapping": "spatial_ref",
-                },
-            ),
-            DataVariableConfig(
-                name="gust",
-                dtype="float32",
-                chunks=chunks,
-                keepbits=10,
-                attrs={
-                    "long_name": "Wind gust",
-                    "units": "m s-1",
-                    "grid_mapping": "spatial_ref",
-                },
-            ),
-            # Precipitation variables
-            DataVariableConfig(
-                name="tp",
-                dtype="float32",
-                chunks=chunks,
-                keepbits=14,
-                attrs={
-                    "long_name": "Total precipitation",
-                    "units": "kg m-2",
-                    "grid_mapping": "spatial_ref",
-                },
-            ),
-            DataVariableConfig(
-                name="prate",
-                dtype="float32",
-                chunks=chunks,
-                keepbits=12,
-                attrs={
-                    "long_name": "Precipitation rate",
-                    "units": "kg m-2 s-1",
-                    "grid_mapping": "spatial_ref",
-                },
-            ),
-            DataVariableConfig(
-                name="snow",
-                dtype="float32",
-                chunks=chunks,
-                keepbits=14,
-                attrs={
-                    "long_name": "Snow accumulation",
-                    "units": "kg m-2",
-                    "grid_mapping": "spatial_ref",
-                },
-            ),
-            # Cloud and visibility
-            DataVariableConfig(
-                name="tcc",
-                dtype="float32",
-                chunks=chunks,
-                keepbits=8,
-                attrs={
-                    "long_name": "Total cloud cover",
-                    "units": "%",
-                    "grid_mapping": "spatial_ref",
-                },
-            ),
-            DataVariableConfig(
-                name="ceil",
-                dtype="float32",
-                chunks=chunks,
-                keepbits=10,
-                attrs={
-                    "long_name": "Ceiling height",
-                    "units": "m",
-                    "grid_mapping": "spatial_ref",
-                },
-            ),
-            DataVariableConfig(
-                name="vis",
-                dtype="float32",
-                chunks=chunks,
-                keepbits=10,
-                attrs={
-                    "long_name": "Visibility",
-                    "units": "m",
-                    "grid_mapping": "spatial_ref",
-                },
-            ),
-            # Radiation
-            DataVariableConfig(
-                name="dswrf",
-                dtype="float32",
-                chunks=chunks,
-                keepbits=12,
-                attrs={
-                    "long_name": "Downward shortwave radiation flux",
-                    "units": "W m-2",
-                    "grid_mapping": "spatial_ref",
-                },
-            ),
-            DataVariableConfig(
-                name="dlwrf",
-                dtype="float32",
-                chunks=chunks,
-                keepbits=12,
-                attrs={
-                    "long_name": "Downward longwave radiation flux",
-                    "units": "W m-2",
-                    "grid_mapping": "spatial_ref",
-                },
-            ),
-            # Pressure and humidity
-            DataVariableConfig(
-                name="sp",
-                dtype="float32",
-                chunks=chunks,
-                keepbits=12,
-                attrs={
-                    "long_name": "Surface pressure",
-                    "units": "Pa",
-                    "grid_mapping": "spatial_ref",
-                },
-            ),
-            DataVariableConfig(
-                name="rh2m",
-                dtype="float32",
-                chunks=chunks,
-                keepbits=10,
-                attrs={
-                    "long_name": "2-meter relative humidity",
-                    "units": "%",
-                    "grid_mapping": "spatial_ref",
-                },
-            ),
-        ]
+        return list(_NBM_DATA_VARS)